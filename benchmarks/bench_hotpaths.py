@@ -0,0 +1,355 @@
+# bench_hotpaths.py
+#
+# Headless micro-benchmarks for the world and render hot paths. Results are
+# written as JSON; pass --compare to check them against a saved baseline.
+#
+#   python -m benchmarks.bench_hotpaths --out baseline.json
+#   python -m benchmarks.bench_hotpaths --compare baseline.json
+#
+# Exits with status 1 when --compare finds a regression.
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import itertools
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import numpy as np
+import pygame
+from engine import settings, assets, render, replay, controls, events, lighting
+from game import world, player, pathfind
+from typing import Callable, Dict
+
+# ──────────────────────────────────────────────────────────────
+# Timing
+# ──────────────────────────────────────────────────────────────
+
+MIN_SAMPLE_SECONDS = 0.02  # calls per sample grow until a sample takes this long
+
+def _measure(fn: Callable[[], None], repeat: int) -> Dict[str, float]:
+    """
+    Time fn over `repeat` samples, each long enough to be above timer
+    noise (the calibration run doubles as warm-up). Returns per-call times
+    in microseconds.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - start >= MIN_SAMPLE_SECONDS:
+            break
+        number *= 2
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number * 1e6)
+    return {
+        'min_us': min(samples),
+        'median_us': statistics.median(samples),
+        'mean_us': statistics.fmean(samples),
+        'samples': repeat,
+        'calls_per_sample': number,
+    }
+
+def _reset_world() -> None:
+    """Drop all loaded chunks and edits."""
+    world.chunks.clear()
+    world.chunk_versions.clear()
+    world.wall_versions.clear()
+    world.edits.clear()
+    world._regions_read.clear()
+    world._unsaved.clear()
+
+# ──────────────────────────────────────────────────────────────
+# Benchmarks
+# ──────────────────────────────────────────────────────────────
+
+def bench_assets(results: dict, repeat: int) -> None:
+    # Startup asset loading with and without the pre-decoded atlas cache,
+    # and scaling the atlas for one zoom level
+    def cold() -> None:
+        if os.path.exists(settings.ASSET_CACHE_FILE):
+            os.remove(settings.ASSET_CACHE_FILE)
+        assets.init_assets()
+
+    results['assets.init_assets (decode PNGs)'] = _measure(cold, repeat)
+    results['assets.init_assets (cached atlas)'] = _measure(assets.init_assets, repeat)
+    ts = settings.SCREEN_W // settings.DEFAULT_TILES_ACROSS
+    results[f'assets sprite set build ({ts}px)'] = _measure(lambda: assets._build_sprite_set(ts), repeat)
+
+def bench_gen_chunk(results: dict, repeat: int) -> None:
+    rng = random.Random(1)
+    coords = [(rng.randrange(-1000, 1000), rng.randrange(-1000, 1000)) for _ in range(64)]
+    it = itertools.cycle(coords)
+    results['world.gen_chunk'] = _measure(lambda: world.gen_chunk(*next(it)), repeat)
+
+def bench_load_chunks(results: dict, repeat: int) -> None:
+    # Walk east one chunk per call so every call crosses a chunk boundary
+    # into ungenerated terrain
+    _reset_world()
+    step = itertools.count()
+    size = settings.CHUNK_SIZE
+    results['world.load_chunks crossing'] = _measure(
+        lambda: world.load_chunks(next(step) * size, 0), repeat)
+
+def bench_wall_depths(results: dict, repeat: int) -> None:
+    saved = settings.LOAD_RADIUS
+    try:
+        for radius in (2, 4, 8):
+            settings.LOAD_RADIUS = radius
+            _reset_world()
+            world.load_chunks(0, 0)
+            results[f'world.compute_wall_depths r={radius}'] = _measure(
+                world.compute_wall_depths, repeat)
+    finally:
+        settings.LOAD_RADIUS = saved
+        _reset_world()
+
+def bench_can_walk(results: dict, repeat: int) -> None:
+    _reset_world()
+    world.load_chunks(0, 0)
+    span = settings.LOAD_RADIUS * settings.CHUNK_SIZE
+    rng = random.Random(2)
+    tiles = [(rng.randrange(-span, span), rng.randrange(-span, span)) for _ in range(1000)]
+
+    def run() -> None:
+        for tx, ty in tiles:
+            world.can_walk(tx, ty)
+
+    timing = _measure(run, repeat)
+    for key in ('min_us', 'median_us', 'mean_us'):
+        timing[key] /= len(tiles)
+    timing['calls_per_sample'] *= len(tiles)
+    results['world.can_walk'] = timing
+
+    x0, y0, w, h = world.loaded_bounds()
+    results[f'world.can_walk_region {w}x{h}'] = _measure(
+        lambda: world.can_walk_region(x0, y0, w, h), repeat)
+
+def bench_pathfind(results: dict, repeat: int) -> None:
+    # Whole searches between random walkable tiles of the loaded area,
+    # reachable or not
+    _reset_world()
+    world.load_chunks(0, 0)
+    x0, y0, w, h = world.loaded_bounds()
+    walk = world.can_walk_region(x0, y0, w, h)
+    ys, xs = np.nonzero(walk)
+    rng = random.Random(3)
+    picks = [rng.randrange(len(xs)) for _ in range(64)]
+    pairs = itertools.cycle(zip(picks, picks[1:]))
+
+    def search() -> None:
+        a, b = next(pairs)
+        pathfind.find_path((x0 + xs[a], y0 + ys[a]), (x0 + xs[b], y0 + ys[b]))
+        while pathfind.advance(settings.PATH_NODES_PER_FRAME) is None:
+            pass
+
+    results[f'pathfind search {w}x{h}'] = _measure(search, repeat)
+
+def bench_lighting(results: dict, repeat: int) -> None:
+    # Torch light map of the overlay window with torches scattered over the
+    # open floor, then the whole overlay rebuild (map + smoothscale)
+    _reset_world()
+    ts = assets.TILE_SIZE
+    ps = player.init_player(ts)
+    ps['tx'], ps['ty'] = 20, -7
+    world.load_chunks(ps['tx'], ps['ty'])
+    x0, y0, w, h = world.loaded_bounds()
+    ys, xs = np.nonzero(world.can_walk_region(x0, y0, w, h))
+    rng = random.Random(4)
+    for i in rng.sample(range(len(xs)), 40):
+        world.set_tile(x0 + int(xs[i]), y0 + int(ys[i]), world.LAYER_WALL, settings.TILE_TORCH)
+    cam_x = settings.SCREEN_W // 2 - ps['tx'] * ts
+    cam_y = settings.SCREEN_H // 2 - ps['ty'] * ts
+    vx0, vy0, vw, vh = lighting._window(ts, cam_x, cam_y)
+    results[f'lighting.light_map {vw}x{vh}'] = _measure(
+        lambda: lighting.light_map(vx0, vy0, vw, vh), repeat)
+
+    def rebuild() -> None:
+        lighting._overlay_key = None
+        lighting.update(ts, cam_x, cam_y)
+
+    results['lighting overlay rebuild'] = _measure(rebuild, repeat)
+    _reset_world()
+
+def bench_input(results: dict, repeat: int) -> None:
+    # One frame of input handling with a few queued mouse motion events:
+    # poll, dispatch, and one sim step of player input. Posting the events
+    # is timed separately and subtracted.
+    ts = assets.TILE_SIZE
+    ps = player.init_player(ts)
+    motion = [pygame.event.Event(pygame.MOUSEMOTION, pos=(i, i), rel=(1, 1), buttons=(0, 0, 0))
+              for i in range(4)]
+
+    def post() -> None:
+        replay._keys = None
+        replay._events_taken = False
+        for ev in motion:
+            pygame.event.post(ev)
+
+    def frame() -> None:
+        post()
+        snapshot = controls.poll()
+        events.handle_events(snapshot, ps, ps, ts, ts, ts)
+        player.update_input(ps, snapshot, ts, 1.0 / settings.SIM_HZ)
+
+    def post_only() -> None:
+        post()
+        pygame.event.clear()
+
+    timing = _measure(frame, repeat)
+    overhead = _measure(post_only, repeat)
+    for key in ('min_us', 'median_us', 'mean_us'):
+        timing[key] -= overhead[key]
+    results['input frame (poll + dispatch + step)'] = timing
+
+def bench_draw_world(results: dict, repeat: int, screen: pygame.Surface) -> None:
+    _reset_world()
+    w = settings.SCREEN_W
+    zooms = (
+        ('min', w // settings.MAX_TILES_ACROSS),
+        ('default', w // settings.DEFAULT_TILES_ACROSS),
+        ('max', w // settings.MIN_TILES_ACROSS),
+    )
+    ps = player.init_player(zooms[1][1])
+    ps['tx'], ps['ty'] = 20, -7
+    world.load_chunks(ps['tx'], ps['ty'])
+    for name, ts in zooms:
+        assets.update_zoom(ts)
+        ps['px'] = ps['target_x'] = ps['tx'] * ts
+        ps['py'] = ps['target_y'] = ps['ty'] * ts
+        results[f'render.draw_world {name} zoom ({ts}px)'] = _measure(
+            lambda: render.draw_world(screen, ps, world.chunks), repeat)
+
+def bench_draw_moving(results: dict, repeat: int, screen: pygame.Surface) -> None:
+    # Camera gliding a few pixels per frame, as while walking between tiles
+    ts = settings.SCREEN_W // settings.DEFAULT_TILES_ACROSS
+    assets.update_zoom(ts)
+    ps = player.init_player(ts)
+    ps['tx'], ps['ty'] = 20, -7
+    world.load_chunks(ps['tx'], ps['ty'])
+    offsets = itertools.cycle(list(range(0, 2 * ts, 3)) + list(range(2 * ts, 0, -3)))
+
+    def frame() -> None:
+        ps['px'] = ps['tx'] * ts + next(offsets)
+        ps['py'] = ps['ty'] * ts
+        render.draw_frame(screen, ps, world.chunks)
+
+    saved = settings.RENDER_MODE
+    try:
+        for mode in ("full", "scroll"):
+            settings.RENDER_MODE = mode
+            results[f'render.draw_frame moving ({mode})'] = _measure(frame, repeat)
+    finally:
+        settings.RENDER_MODE = saved
+
+# ──────────────────────────────────────────────────────────────
+# Baseline Comparison
+# ──────────────────────────────────────────────────────────────
+
+def compare(current: dict, baseline: dict, threshold: float) -> bool:
+    """
+    Print current vs baseline best-of-samples times, which are less noisy
+    than medians. Returns True if any benchmark is slower than the baseline
+    by more than `threshold` (a fraction).
+    """
+    regressed = False
+    print(f"{'benchmark':<40} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for name, timing in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            print(f"{name:<40} {'-':>12} {timing['min_us']:>10.1f}us {'new':>7}")
+            continue
+        ratio = timing['min_us'] / base['min_us']
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        print(f"{name:<40} {base['min_us']:>10.1f}us {timing['min_us']:>10.1f}us "
+              f"{ratio:>6.2f}x{flag}")
+    return regressed
+
+# ──────────────────────────────────────────────────────────────
+# Entry Point
+# ──────────────────────────────────────────────────────────────
+
+def run(screen_size: tuple, repeat: int) -> dict:
+    """Run every benchmark and return the JSON-ready report."""
+    pygame.init()
+    settings.SCREEN_W, settings.SCREEN_H = screen_size
+    screen = pygame.display.set_mode(screen_size)
+    assets.init_assets()
+    render.init_render()
+    assets.update_zoom(settings.SCREEN_W // settings.DEFAULT_TILES_ACROSS)
+
+    results = {}
+    bench_assets(results, repeat)
+    assets.update_zoom(settings.SCREEN_W // settings.DEFAULT_TILES_ACROSS)
+    bench_gen_chunk(results, repeat)
+    bench_load_chunks(results, repeat)
+    bench_wall_depths(results, repeat)
+    bench_can_walk(results, repeat)
+    bench_pathfind(results, repeat)
+    bench_lighting(results, repeat)
+    bench_input(results, repeat)
+    bench_draw_world(results, repeat, screen)
+    bench_draw_moving(results, repeat, screen)
+    world.shutdown_workers()
+    pygame.quit()
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'screen': list(screen_size),
+            'repeat': repeat,
+            'time': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        'results': results,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="World and render micro-benchmarks")
+    parser.add_argument("--out", help="write the JSON report to this file (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare against a saved JSON report")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="slowdown fraction counted as a regression (default 0.20)")
+    parser.add_argument("--repeat", type=int, default=7, help="timed samples per benchmark")
+    parser.add_argument("--size", default="1920x1080", help="screen size WxH for render benchmarks")
+    args = parser.parse_args()
+
+    screen_size = tuple(int(v) for v in args.size.lower().split("x"))
+    # Keep region files from a real save, and the real asset cache, out of
+    # the measurements
+    with tempfile.TemporaryDirectory() as save_dir:
+        settings.SAVE_DIR = save_dir
+        settings.ASSET_CACHE_FILE = os.path.join(save_dir, "assets.cache")
+        report = run(screen_size, args.repeat)
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    elif not args.compare:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
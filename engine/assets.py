@@ -1,8 +1,15 @@
 # assets.py
 
+import io
 import os
+import json
+import struct
+import hashlib
+import threading
 import pygame
+from collections import OrderedDict
 from engine import settings
+from typing import Dict, Iterable, List, Optional, Tuple
 
 # ──────────────────────────────────────────────────────────────
 # Globals (populated by init_assets/update_zoom)
@@ -14,16 +21,9 @@ TILE_SIZE: int = None
 floor_img: pygame.Surface = None
 wall_img: pygame.Surface = None
 player_img: pygame.Surface = None
-LIGHT_RADIUS: int = None
-light_mask: pygame.Surface = None
+torch_img: pygame.Surface = None
 move_speed: float = None
 
-# Private originals (used for rescaling)
-_orig_floor: pygame.Surface = None
-_orig_wall: pygame.Surface = None
-_orig_player: pygame.Surface = None
-
-# Add these globals at the top (after the originals)
 rim_north_img: pygame.Surface = None
 rim_south_img: pygame.Surface = None
 rim_east_img: pygame.Surface = None
@@ -34,101 +34,474 @@ rim_ne_img: pygame.Surface = None
 rim_sw_img: pygame.Surface = None
 rim_se_img: pygame.Surface = None
 
-# Add originals for rim overlays
-_orig_rim_north: pygame.Surface = None
-_orig_rim_south: pygame.Surface = None
-_orig_rim_east: pygame.Surface = None
-_orig_rim_west: pygame.Surface = None
+# The current zoom's sprite atlas and each sprite's rect in it; the
+# *_img sprites above are subsurfaces of it
+atlas: pygame.Surface = None
+atlas_rects: Dict[str, pygame.Rect] = {}
+
+# Originals packed into one atlas and each original's rect in it
+_atlas: pygame.Surface = None
+_atlas_rects: Dict[str, pygame.Rect] = {}
+
+# Composited wall + rim sprites for the current zoom, tinted by depth and
+# keyed by rim mask | depth << 8. Each is WALL_LIFT px taller than
+# WALL_HEIGHT to make room for the raised SW/SE corner overlays. Points into
+# the current sprite set (_sprites)'s 'walls' dict; _core_strips into its
+# 'core_strips' dict.
+WALL_LIFT: int = None
+_sprites: dict = {}
+_wall_sprites: Dict[int, pygame.Surface] = {}
+_core_strips: Dict[int, pygame.Surface] = {}
+
+# Scaled sprite sets keyed by tile size, least recently used first.
+# Each set is a dict of its scaled 'atlas', the sprites in it by name (as
+# subsurfaces), their 'rects' and the 'walls' and 'core_strips' composites;
+# _sprite_set_bytes tracks the pixel memory of each for eviction.
+_sprite_sets: "OrderedDict[int, dict]" = OrderedDict()
+_sprite_set_bytes: Dict[int, int] = {}
+_sprite_sets_lock = threading.Lock()
+_scale_lock = threading.Lock()  # the atlas is only read by one thread at a time
+_prewarm_thread: threading.Thread = None
 
-_orig_rim_nw: pygame.Surface = None
-_orig_rim_ne: pygame.Surface = None
-_orig_rim_sw: pygame.Surface = None
-_orig_rim_se: pygame.Surface = None
+zoom_cache_hits = 0
+zoom_cache_misses = 0
 
 # ──────────────────────────────────────────────────────────────
 # Asset Initialization & Scaling
 # ──────────────────────────────────────────────────────────────
 
-def _load_image(filename: str) -> pygame.Surface:
-    """Load an image from the assets directory with alpha support."""
+def _read_asset(filename: str) -> bytes:
+    """Read an image file from the assets directory, undecoded."""
     path = os.path.join(settings.ASSETS_DIR, filename)
     try:
-        return pygame.image.load(path).convert_alpha()
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError as e:
+        raise RuntimeError(f"Failed to load asset '{filename}': {e}")
+
+def _decode_image(filename: str, data: bytes) -> pygame.Surface:
+    """Decode an image file's contents with alpha support."""
+    try:
+        return pygame.image.load(io.BytesIO(data), filename).convert_alpha()
     except pygame.error as e:
         raise RuntimeError(f"Failed to load asset '{filename}': {e}")
 
 def init_assets() -> None:
     """
-    Loads original images into memory.
+    Loads the original images into the sprite atlas, from the pre-decoded
+    cache when the asset files are unchanged.
     Call once after pygame.init() and display.set_mode().
     """
-    global _orig_floor, _orig_wall, _orig_player
-    global _orig_rim_north, _orig_rim_south, _orig_rim_east, _orig_rim_west
-    global _orig_rim_nw, _orig_rim_ne, _orig_rim_sw, _orig_rim_se
+    global _atlas, _atlas_rects
 
-    _orig_floor  = _load_image(settings.FLOOR_TILE_FILE)
-    _orig_wall   = _load_image(settings.WALL_TILE_FILE)
-    _orig_player = _load_image(settings.PLAYER_SPRITE_FILE)
+    sources = {name: _read_asset(filename) for name, filename, _ in _SPRITES}
+    digest = _sources_digest(sources)
+    cached = _load_atlas_cache(digest)
+    if cached is not None:
+        surf, rects = cached
+    else:
+        surf, rects = _build_atlas(sources)
+        _save_atlas_cache(digest, surf, rects)
+    _atlas, _atlas_rects = surf, rects
 
-    # Load all rim overlays using _load_image for consistent paths
-    _orig_rim_north = _load_image("rim_north.png")
-    _orig_rim_south = _load_image("rim_south.png")
-    _orig_rim_east  = _load_image("rim_east.png")
-    _orig_rim_west  = _load_image("rim_west.png")
-    _orig_rim_nw    = _load_image("rim_nw.png")
-    _orig_rim_ne    = _load_image("rim_ne.png")
-    _orig_rim_sw    = _load_image("rim_sw.png")
-    _orig_rim_se    = _load_image("rim_se.png")
+    # Sets scaled from the previous originals are stale
+    with _sprite_sets_lock:
+        _sprite_sets.clear()
+        _sprite_set_bytes.clear()
 
 def update_zoom(new_size: int) -> None:
     """
-    Rescale all sprites & recompute light mask & move_speed.
+    Switch all sprites & move_speed to a new tile size.
+    Scaled sets come from the zoom cache when present.
     Requires that init_assets() has run.
     """
-    global TILE_SIZE, floor_img, wall_img, player_img
-    global WALL_HEIGHT
-    global LIGHT_RADIUS, light_mask, move_speed
+    global TILE_SIZE, atlas, atlas_rects, floor_img, wall_img, player_img, torch_img
+    global WALL_HEIGHT, WALL_LIFT, _sprites, _wall_sprites, _core_strips
+    global move_speed
     global rim_north_img, rim_south_img, rim_east_img, rim_west_img
     global rim_nw_img, rim_ne_img, rim_sw_img, rim_se_img
 
     TILE_SIZE = max(1, new_size)
-    WALL_HEIGHT = int(TILE_SIZE * 1.5)  # 1.5x tile size for tall wall
+    WALL_HEIGHT, WALL_LIFT = _wall_metrics(TILE_SIZE)
+
+    sprites = _sprites = _get_sprite_set(TILE_SIZE)
+    atlas       = sprites['atlas']
+    atlas_rects = sprites['rects']
+    _wall_sprites = sprites['walls']
+    _core_strips = sprites['core_strips']
 
-    # Rescale from originals
-    floor_img  = pygame.transform.scale(_orig_floor,  (TILE_SIZE, TILE_SIZE))
-    wall_img   = pygame.transform.scale(_orig_wall,   (TILE_SIZE, WALL_HEIGHT))
-    player_img = pygame.transform.scale(_orig_player, (TILE_SIZE, TILE_SIZE))
+    floor_img  = sprites['floor']
+    wall_img   = sprites['wall']
+    player_img = sprites['player']
+    torch_img  = sprites['torch']
 
-    # Rescale rim overlays to match TILE_SIZE
-    rim_north_img = pygame.transform.scale(_orig_rim_north, (TILE_SIZE, WALL_HEIGHT))
-    rim_south_img = pygame.transform.scale(_orig_rim_south, (TILE_SIZE, WALL_HEIGHT))
-    rim_east_img  = pygame.transform.scale(_orig_rim_east,  (TILE_SIZE, WALL_HEIGHT))
-    rim_west_img  = pygame.transform.scale(_orig_rim_west,  (TILE_SIZE, WALL_HEIGHT))
+    rim_north_img = sprites['rim_north']
+    rim_south_img = sprites['rim_south']
+    rim_east_img  = sprites['rim_east']
+    rim_west_img  = sprites['rim_west']
 
-    rim_nw_img = pygame.transform.scale(_orig_rim_nw, (TILE_SIZE, WALL_HEIGHT))
-    rim_ne_img = pygame.transform.scale(_orig_rim_ne, (TILE_SIZE, WALL_HEIGHT))
-    rim_sw_img = pygame.transform.scale(_orig_rim_sw, (TILE_SIZE, WALL_HEIGHT))
-    rim_se_img = pygame.transform.scale(_orig_rim_se, (TILE_SIZE, WALL_HEIGHT))
+    rim_nw_img = sprites['rim_nw']
+    rim_ne_img = sprites['rim_ne']
+    rim_sw_img = sprites['rim_sw']
+    rim_se_img = sprites['rim_se']
 
-    # Lighting and movement
-    LIGHT_RADIUS = TILE_SIZE * settings.LIGHT_RADIUS_TILES
-    light_mask   = make_light_mask(LIGHT_RADIUS)
-    move_speed   = settings.SPEED_TILES_PER_SEC * TILE_SIZE
+    move_speed = settings.SPEED_TILES_PER_SEC * TILE_SIZE
 
 # ──────────────────────────────────────────────────────────────
-# Lighting
+# Sprite Atlas
 # ──────────────────────────────────────────────────────────────
+#
+# The originals are packed into one atlas surface, one shelf (row) per
+# distinct size and scaling. The decoded atlas is cached as raw RGBA pixels
+# in settings.ASSET_CACHE_FILE, keyed by a hash of the asset files'
+# contents, so a launch with unchanged assets decodes no PNGs. A zoom level
+# scales the atlas one shelf per transform, straight into a scaled atlas
+# laid out the same way; as every sprite on a shelf has the same size, that
+# gives the same pixels as scaling each sprite alone. The sprites are
+# subsurfaces of the scaled atlas.
+
+# name, file in ASSETS_DIR, and whether it is scaled to WALL_HEIGHT rather
+# than TILE_SIZE tall
+_SPRITES = (
+    ('floor',     settings.FLOOR_TILE_FILE,    False),
+    ('wall',      settings.WALL_TILE_FILE,     True),
+    ('player',    settings.PLAYER_SPRITE_FILE, False),
+    ('rim_north', "rim_north.png",             True),
+    ('rim_south', "rim_south.png",             True),
+    ('rim_east',  "rim_east.png",              True),
+    ('rim_west',  "rim_west.png",              True),
+    ('rim_nw',    "rim_nw.png",                True),
+    ('rim_ne',    "rim_ne.png",                True),
+    ('rim_sw',    "rim_sw.png",                True),
+    ('rim_se',    "rim_se.png",                True),
+)
+
+_CACHE_MAGIC = b"ENDA"
+_CACHE_VERSION = 1
+_CACHE_HEADER = struct.Struct("<4sHI")  # magic, version, JSON header length
+
+def _shelves(sizes: Dict[str, Tuple[int, int]], tall: Dict[str, bool]) -> List[List[str]]:
+    """Group sprite names into shelves of equal size and scaling, tallest first."""
+    shelves: Dict[tuple, List[str]] = {}
+    for name, size in sizes.items():
+        shelves.setdefault((size[1], size[0], tall[name]), []).append(name)
+    return [shelves[key] for key in sorted(shelves, reverse=True)]
+
+def _pack(
+    shelves: List[List[str]],
+    sizes: Dict[str, Tuple[int, int]]
+) -> Tuple[Dict[str, pygame.Rect], Tuple[int, int]]:
+    """
+    Lay out sprites of the given sizes shelf by shelf, each shelf a row.
+    Returns the rects by name and the atlas size.
+    """
+    rects = {}
+    width = y = 0
+    for shelf in shelves:
+        w, h = sizes[shelf[0]]
+        for i, name in enumerate(shelf):
+            rects[name] = pygame.Rect(i * w, y, w, h)
+        width = max(width, len(shelf) * w)
+        y += h
+    return rects, (width, y)
+
+def _build_atlas(sources: Dict[str, bytes]) -> Tuple[pygame.Surface, Dict[str, pygame.Rect]]:
+    """Decode the asset files and pack them into one atlas surface."""
+    images = {
+        name: _decode_image(filename, sources[name])
+        for name, filename, _ in _SPRITES
+    }
+    sizes = {name: img.get_size() for name, img in images.items()}
+    rects, size = _pack(_shelves(sizes, {name: tall for name, _, tall in _SPRITES}), sizes)
+    surf = pygame.Surface(size, flags=pygame.SRCALPHA).convert_alpha()
+    pixels = pygame.surfarray.pixels2d(surf)
+    for name, img in images.items():
+        r = rects[name]
+        pixels[r.left:r.right, r.top:r.bottom] = pygame.surfarray.array2d(img)  # copied, not blended
+    del pixels  # release the surface lock
+    return surf, rects
 
-def make_light_mask(radius: int) -> pygame.Surface:
+def _scale_atlas(ts: int) -> Tuple[pygame.Surface, Dict[str, pygame.Rect]]:
     """
-    Create a radial light mask surface with a smooth gradient.
+    Return the atlas with every sprite scaled for tile size `ts`, and the
+    sprites' rects in it.
+    """
+    original, src_rects = _atlas, _atlas_rects
+    wall_h = _wall_metrics(ts)[0]
+    tall = {name: t for name, _, t in _SPRITES}
+    shelves = _shelves({name: r.size for name, r in src_rects.items()}, tall)
+    rects, size = _pack(shelves, {name: (ts, wall_h if tall[name] else ts) for name in tall})
+
+    surf = pygame.Surface(size, pygame.SRCALPHA, original)  # same pixel format
+    with _scale_lock:
+        for shelf in shelves:
+            src = src_rects[shelf[0]].unionall([src_rects[name] for name in shelf])
+            dst = rects[shelf[0]].unionall([rects[name] for name in shelf])
+            pygame.transform.scale(original.subsurface(src), dst.size, surf.subsurface(dst))
+    return surf, rects
+
+def _sources_digest(sources: Dict[str, bytes]) -> str:
+    """Hash of the asset files' names and contents."""
+    h = hashlib.sha1()
+    for name, filename, _ in _SPRITES:
+        h.update(f"{name}:{filename}:{len(sources[name])}:".encode())
+        h.update(sources[name])
+    return h.hexdigest()
+
+def _load_atlas_cache(digest: str) -> Optional[Tuple[pygame.Surface, Dict[str, pygame.Rect]]]:
+    """
+    Return the cached atlas and its rects if the cache file was built from
+    assets matching `digest`; None if it is missing, stale or unreadable.
+    """
+    try:
+        with open(settings.ASSET_CACHE_FILE, "rb") as f:
+            data = f.read()
+        magic, version, header_len = _CACHE_HEADER.unpack_from(data)
+        if (magic, version) != (_CACHE_MAGIC, _CACHE_VERSION):
+            return None
+        header = json.loads(data[_CACHE_HEADER.size:_CACHE_HEADER.size + header_len])
+        if header['digest'] != digest:
+            return None
+        size = tuple(header['size'])
+        raw = data[_CACHE_HEADER.size + header_len:]
+        surf = pygame.image.frombytes(raw, size, "RGBA").convert_alpha()
+        rects = {name: pygame.Rect(r) for name, r in header['rects'].items()}
+    except (OSError, ValueError, KeyError, TypeError, struct.error, pygame.error):
+        return None
+    return surf, rects
+
+def _save_atlas_cache(digest: str, surf: pygame.Surface, rects: Dict[str, pygame.Rect]) -> None:
+    """Write the atlas cache file. Failing to write it is not an error."""
+    header = json.dumps({
+        'digest': digest,
+        'size': list(surf.get_size()),
+        'rects': {name: list(r) for name, r in rects.items()},
+    }).encode()
+    path = settings.ASSET_CACHE_FILE
+    try:
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_CACHE_HEADER.pack(_CACHE_MAGIC, _CACHE_VERSION, len(header)))
+            f.write(header)
+            f.write(pygame.image.tobytes(surf, "RGBA"))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+# ──────────────────────────────────────────────────────────────
+# Zoom Cache
+# ──────────────────────────────────────────────────────────────
+
+def _surface_bytes(surf: pygame.Surface) -> int:
+    return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+def _build_sprite_set(ts: int) -> dict:
+    """Scale the atlas to tile size `ts` and draw the torch sprite."""
+    surf, rects = _scale_atlas(ts)
+    sprites = {'atlas': surf, 'rects': rects}
+    for name, rect in rects.items():
+        sprites[name] = surf.subsurface(rect)
+    sprites['torch'] = _make_torch(ts)
+    sprites['walls'] = {}
+    sprites['core_strips'] = {}
+    return sprites
+
+def _store_sprite_set(ts: int, sprites: dict, evict: bool) -> bool:
     """
-    mask = pygame.Surface((radius * 2, radius * 2), flags=pygame.SRCALPHA)
-    for r in range(radius, 0, -1):
-        # Use quadratic falloff for a smoother gradient
-        alpha = int(255 * ((r / radius) ** 2))
-        pygame.draw.circle(mask, (0, 0, 0, alpha), (radius, radius), r)
-    return mask
+    Add a sprite set to the cache as most recently used. With `evict`,
+    older sets are dropped to stay within ZOOM_CACHE_MAX_MB; otherwise the
+    set is only stored if it fits. Returns True if it was stored.
+    """
+    size = sum(
+        _surface_bytes(v) for v in sprites.values()
+        if isinstance(v, pygame.Surface) and v.get_parent() is None  # subsurfaces share the atlas
+    )
+    size += sum(_surface_bytes(v) for v in sprites['walls'].values())
+    size += sum(_surface_bytes(v) for v in sprites['core_strips'].values())
+    budget = settings.ZOOM_CACHE_MAX_MB * 1024 * 1024
+    with _sprite_sets_lock:
+        if ts in _sprite_sets:
+            return True
+        used = sum(_sprite_set_bytes.values())
+        if not evict and used + size > budget:
+            return False
+        while _sprite_sets and used + size > budget:
+            old, _ = _sprite_sets.popitem(last=False)
+            used -= _sprite_set_bytes.pop(old)
+        _sprite_sets[ts] = sprites
+        _sprite_set_bytes[ts] = size
+        return True
+
+def _get_sprite_set(ts: int) -> dict:
+    """Return the sprite set for tile size `ts`, building it on a miss."""
+    global zoom_cache_hits, zoom_cache_misses
+    with _sprite_sets_lock:
+        sprites = _sprite_sets.get(ts)
+        if sprites is not None:
+            _sprite_sets.move_to_end(ts)
+            zoom_cache_hits += 1
+            return sprites
+        zoom_cache_misses += 1
+    sprites = _build_sprite_set(ts)
+    _store_sprite_set(ts, sprites, evict=True)
+    with _sprite_sets_lock:
+        # A prewarm may have stored the same size meanwhile; use that copy
+        return _sprite_sets.get(ts, sprites)
+
+def zoom_levels(default_px: int, min_px: int, max_px: int) -> List[int]:
+    """
+    Tile sizes reachable by mouse-wheel zooming from `default_px`
+    (ZOOM_STEP_PX per tick, clamped to [min_px, max_px]), fewest ticks first.
+    """
+    step = settings.ZOOM_STEP_PX
+    order = [default_px]
+    seen = {default_px}
+    for ts in order:
+        for nxt in (ts - step, ts + step):
+            nxt = max(min_px, min(max_px, nxt))
+            if nxt not in seen:
+                seen.add(nxt)
+                order.append(nxt)
+    return order[1:]
+
+def prewarm_zoom(sizes: Iterable[int], wall_keys: Iterable[Tuple[int, int]] = ()) -> None:
+    """
+    Build sprite sets for `sizes` on a background thread, in order, so
+    later zooms are a cache lookup. Each set gets the wall composites for
+    the (rim mask, depth) pairs in `wall_keys` and every core strip a
+    screen row can use, so the first frame at a new zoom builds none.
+    Stops once the cache budget is full rather than evicting sets already
+    in use.
+    """
+    global _prewarm_thread
+    sizes = list(sizes)
+    wall_keys = list(wall_keys)
+
+    def run() -> None:
+        for ts in sizes:
+            with _sprite_sets_lock:
+                if ts in _sprite_sets:
+                    continue
+            sprites = _build_sprite_set(ts)
+            for mask, depth in wall_keys:
+                sprites['walls'][mask | depth << 8] = _compose_wall(sprites, ts, mask, depth)
+            # Core runs are split into power-of-two strips no wider than a
+            # screen row of tiles
+            n = 1
+            while n <= settings.SCREEN_W // ts + 2:
+                sprites['core_strips'][n] = _compose_core_strip(sprites, ts, n)
+                n *= 2
+            if not _store_sprite_set(ts, sprites, evict=False):
+                break
+
+    _prewarm_thread = threading.Thread(target=run, name="zoom-prewarm", daemon=True)
+    _prewarm_thread.start()
+
+def zoom_cache_stats() -> dict:
+    """Return hit/miss counters and the size of the zoom cache."""
+    with _sprite_sets_lock:
+        return {
+            'hits': zoom_cache_hits,
+            'misses': zoom_cache_misses,
+            'sizes': len(_sprite_sets),
+            'bytes': sum(_sprite_set_bytes.values()),
+        }
+
+# ──────────────────────────────────────────────────────────────
+# Wall Autotiles
+# ──────────────────────────────────────────────────────────────
+
+def _depth_shade(depth: int) -> tuple:
+    """Multiply colour darkening walls at `depth`."""
+    shade = round(255 * max(0.0, 1.0 - settings.DEPTH_SHADE_STEP * depth))
+    return shade, shade, shade
+
+def _wall_metrics(ts: int) -> Tuple[int, int]:
+    """WALL_HEIGHT and WALL_LIFT for tile size `ts`."""
+    # 1.5x tile size for tall wall; raised corner offset is -ts // 2
+    return int(ts * 1.5), -(-ts // 2)
+
+def wall_sprite(mask: int, depth: int = 0) -> pygame.Surface:
+    """
+    Return the wall sprite with the rim overlays selected by `mask`
+    (settings.RIM_* bits) composited on top and darkened for `depth`,
+    building it on first use. Blit it WALL_LIFT px above where the plain
+    wall sprite would go.
+    """
+    key = mask | depth << 8
+    surf = _wall_sprites.get(key)
+    if surf is not None:
+        return surf
+    surf = _compose_wall(_sprites, TILE_SIZE, mask, depth)
+    _wall_sprites[key] = surf
+    _add_set_bytes(surf)
+    return surf
+
+def _compose_wall(sprites: dict, ts: int, mask: int, depth: int) -> pygame.Surface:
+    """Build wall_sprite(mask, depth) from the sprite set `sprites` of tile size `ts`."""
+    wall_h, lift = _wall_metrics(ts)
+    surf = pygame.Surface((ts, wall_h + lift), flags=pygame.SRCALPHA)
+    surf.blit(sprites['wall'], (0, lift))
+    for bit, name in (
+        (settings.RIM_N, 'rim_north'),
+        (settings.RIM_W, 'rim_west'),
+        (settings.RIM_E, 'rim_east'),
+        (settings.RIM_S, 'rim_south'),
+        (settings.RIM_NW, 'rim_nw'),
+        (settings.RIM_NE, 'rim_ne'),
+    ):
+        if mask & bit:
+            surf.blit(sprites[name], (0, lift))
+    # Corners below an open south side sit flush; otherwise they are raised
+    corner_y = lift if mask & settings.RIM_S else 0
+    if mask & settings.RIM_SW:
+        surf.blit(sprites['rim_sw'], (0, corner_y))
+    if mask & settings.RIM_SE:
+        surf.blit(sprites['rim_se'], (0, corner_y))
+    if depth:
+        surf.fill(_depth_shade(depth), special_flags=pygame.BLEND_RGB_MULT)
+    return surf
+
+def core_strip(tiles: int) -> pygame.Surface:
+    """
+    Return `tiles` solid-core walls (depth MAX_CORE_DEPTH, no rims) side by
+    side as one opaque surface, building it on first use. Blit it where the
+    plain wall sprite would go. Rows of core walls are drawn from a few of
+    these, copied without alpha blending, instead of one sprite per tile.
+    """
+    surf = _core_strips.get(tiles)
+    if surf is not None:
+        return surf
+    surf = _compose_core_strip(_sprites, TILE_SIZE, tiles)
+    _core_strips[tiles] = surf
+    _add_set_bytes(surf)
+    return surf
+
+def _compose_core_strip(sprites: dict, ts: int, tiles: int) -> pygame.Surface:
+    """Build core_strip(tiles) from the sprite set `sprites` of tile size `ts`."""
+    surf = pygame.Surface((tiles * ts, _wall_metrics(ts)[0])).convert()
+    surf.blits([(sprites['wall'], (i * ts, 0)) for i in range(tiles)], False)
+    surf.fill(_depth_shade(settings.MAX_CORE_DEPTH), special_flags=pygame.BLEND_RGB_MULT)
+    return surf
+
+def _add_set_bytes(surf: pygame.Surface) -> None:
+    """Count a surface built on demand towards the current set's size."""
+    with _sprite_sets_lock:
+        if TILE_SIZE in _sprite_set_bytes:
+            _sprite_set_bytes[TILE_SIZE] += _surface_bytes(surf)
+
+# ──────────────────────────────────────────────────────────────
+# Torch Sprite
+# ──────────────────────────────────────────────────────────────
+
+def _make_torch(ts: int) -> pygame.Surface:
+    """Draw a torch sprite for tile size `ts`: a stick with a flame on top."""
+    surf = pygame.Surface((ts, ts), flags=pygame.SRCALPHA)
+    stick_w = max(1, ts // 8)
+    pygame.draw.rect(surf, (110, 70, 40), ((ts - stick_w) // 2, ts * 2 // 5, stick_w, ts // 2))
+    pygame.draw.circle(surf, (255, 140, 30), (ts // 2, ts * 3 // 10), max(1, ts // 6))
+    pygame.draw.circle(surf, (255, 230, 120), (ts // 2, ts * 3 // 10), max(1, ts // 12))
+    return surf
 
 # ──────────────────────────────────────────────────────────────
 # Utility (optional: for reloading assets at runtime)
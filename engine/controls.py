@@ -0,0 +1,41 @@
+# controls.py
+
+import pygame
+from engine import replay
+from typing import Any, Dict
+
+# ──────────────────────────────────────────────────────────────
+# Input Snapshot
+# ──────────────────────────────────────────────────────────────
+#
+# Input is polled once per frame into a snapshot dict that the event
+# handlers and every simulation step of that frame read:
+#
+#   quit       window close requested
+#   keys       held key state, indexed with pygame key constants
+#   keys_down  key codes pressed this frame, in order
+#   wheel      net mouse wheel notches (positive = away from the user)
+#   clicks     (button, pos) for each mouse button press, in order
+#
+# Polling goes through replay, so recordings capture it and replays
+# substitute for it.
+
+def poll() -> Dict[str, Any]:
+    """Drain this frame's events and key state into an input snapshot."""
+    snapshot = {
+        'quit': False,
+        'keys': replay.get_pressed(),
+        'keys_down': [],
+        'wheel': 0,
+        'clicks': [],
+    }
+    for event in replay.get_events():
+        if event.type == pygame.QUIT:
+            snapshot['quit'] = True
+        elif event.type == pygame.KEYDOWN:
+            snapshot['keys_down'].append(event.key)
+        elif event.type == pygame.MOUSEWHEEL:
+            snapshot['wheel'] += (event.y > 0) - (event.y < 0)
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            snapshot['clicks'].append((event.button, event.pos))
+    return snapshot
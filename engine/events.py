@@ -1,6 +1,7 @@
 import sys
+import math
 import pygame
-from engine import settings, assets
+from engine import settings, assets, profiler
 from game import world, player
 
 # ──────────────────────────────────────────────────────────────
@@ -12,12 +13,13 @@ def set_zoom(player_state: dict, new_size: int) -> None:
     Update zoom level and reposition player accordingly.
     """
     assets.update_zoom(new_size)
-    world.load_chunks(player_state['tx'], player_state['ty'])
     px = player_state['tx'] * assets.TILE_SIZE
     py = player_state['ty'] * assets.TILE_SIZE
     player_state.update({
         'px': px,
         'py': py,
+        'prev_px': px,
+        'prev_py': py,
         'target_x': px,
         'target_y': py
     })
@@ -26,88 +28,131 @@ def set_zoom(player_state: dict, new_size: int) -> None:
 # Digging & Building
 # ──────────────────────────────────────────────────────────────
 
+# Dig/build clicks waiting for the next simulation step: (button, gx, gy)
+pending_actions: list = []
+
+def screen_to_tile(view_state: dict, pos: tuple) -> tuple[int, int]:
+    """
+    Return the world tile under screen position `pos`, for the camera as
+    drawn from `view_state`.
+    """
+    mx, my = pos
+    # Floored like the renderer's camera, so a click between tiles hits the
+    # tile drawn under it
+    cam_x = math.floor(settings.SCREEN_W // 2 - view_state['px'])
+    cam_y = math.floor(settings.SCREEN_H // 2 - view_state['py'])
+    gx = (mx - cam_x) // assets.TILE_SIZE
+    gy = (my - cam_y) // assets.TILE_SIZE
+    return gx, gy
+
 def handle_dig_build(
-    ev: pygame.event.Event,
+    button: int,
+    gx: int,
+    gy: int,
     player_state: dict,
     warn_timer: int,
     WARN_DURATION: int
 ) -> tuple[int, bool]:
     """
-    Handle digging and building logic.
+    Handle digging (button 1) and building or torch placing (button 3) at
+    tile (gx, gy).
     Returns (warn_timer, block_changed).
     """
-    mx, my = ev.pos
-    cam_x = settings.SCREEN_W // 2 - player_state['px']
-    cam_y = settings.SCREEN_H // 2 - player_state['py']
-    gx = int((mx - cam_x) // assets.TILE_SIZE)
-    gy = int((my - cam_y) // assets.TILE_SIZE)
-
     # Spawn protection
     if abs(gx) <= settings.SPAWN_PROTECT_WIDTH and abs(gy) <= settings.SPAWN_PROTECT_HEIGHT:
         return WARN_DURATION, False
 
-    ccx, lx = divmod(gx, settings.CHUNK_SIZE)
-    ccy, ly = divmod(gy, settings.CHUNK_SIZE)
-    chunk = world.chunks.get((ccx, ccy))
-    if not chunk:
-        return warn_timer, False
-    floor, wall = chunk
-
-    # Ensure indices valid
-    if not (0 <= lx < settings.CHUNK_SIZE and 0 <= ly < settings.CHUNK_SIZE):
+    wall = world.get_tile(gx, gy, world.LAYER_WALL)
+    if wall is None:
         return warn_timer, False
 
     block_changed = False
-    if ev.button == 1:
-        # DIG: remove wall first, then floor
-        if wall[ly][lx] == settings.TILE_DIRT:
-            wall[ly][lx] = settings.TILE_EMPTY
+    if button == 1:
+        # DIG: pick up a torch, else remove wall first, then floor
+        if wall == settings.TILE_TORCH:
+            world.set_tile(gx, gy, world.LAYER_WALL, settings.TILE_EMPTY)
+            player.add_to_hotbar(player_state, 'torch', assets.torch_img)
+            block_changed = True
+        elif wall == settings.TILE_DIRT:
+            world.set_tile(gx, gy, world.LAYER_WALL, settings.TILE_EMPTY)
             player.add_to_hotbar(player_state, 'dirt', assets.floor_img)
             block_changed = True
-        elif floor[ly][lx] == settings.TILE_DIRT:
-            floor[ly][lx] = settings.TILE_EMPTY
+        elif world.get_tile(gx, gy, world.LAYER_FLOOR) == settings.TILE_DIRT:
+            world.set_tile(gx, gy, world.LAYER_FLOOR, settings.TILE_EMPTY)
             player.add_to_hotbar(player_state, 'dirt', assets.floor_img)
             block_changed = True
-    elif ev.button == 3:
-        # BUILD: place dirt on floor or wall
-        placed = player.place_dirt(player_state, gx, gy, floor, wall)
+    elif button == 3:
+        # BUILD: place the selected torch, or dirt on floor or wall
+        if player.selected_type(player_state) == 'torch':
+            placed = player.place_torch(player_state, gx, gy)
+        else:
+            placed = player.place_dirt(player_state, gx, gy)
         if placed:
             block_changed = True
     return warn_timer, block_changed
 
+def apply_actions(player_state: dict, warn_timer: float, WARN_DURATION: float) -> tuple[float, bool]:
+    """
+    Apply queued dig/build clicks; called from the simulation step.
+    Returns (warn_timer, block_changed).
+    """
+    block_changed = False
+    for button, gx, gy in pending_actions:
+        warn_timer, changed = handle_dig_build(button, gx, gy, player_state, warn_timer, WARN_DURATION)
+        block_changed = block_changed or changed
+    pending_actions.clear()
+    return warn_timer, block_changed
+
 # ──────────────────────────────────────────────────────────────
 # Main Event Loop
 # ──────────────────────────────────────────────────────────────
 
 def handle_events(
+    snapshot: dict,
     player_state: dict,
+    view_state: dict,
     default_tile_size: int,
     min_px: int,
-    max_px: int,
-    warn_timer: int,
-    WARN_DURATION: int
-) -> tuple[int, bool]:
+    max_px: int
+) -> None:
     """
-    Handle all pygame events for the main game loop.
-    Returns (warn_timer, block_changed).
+    Apply a frame's input snapshot (see controls.poll). Zoom and hotkeys
+    take effect at once; dig/build clicks are resolved to tiles against the
+    camera as last drawn (`view_state`) and queued for the simulation.
+    Ctrl+left-click walks to the clicked tile instead of digging.
     """
-    block_changed = False
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
-        elif event.type == pygame.MOUSEWHEEL:
-            delta = 4 if event.y > 0 else -4
-            desired = assets.TILE_SIZE + delta
-            new_size = max(min_px, min(max_px, desired))
-            if new_size != assets.TILE_SIZE:
-                set_zoom(player_state, new_size)
-        elif event.type == pygame.MOUSEBUTTONDOWN:
-            if event.button == 2:
-                if assets.TILE_SIZE != default_tile_size:
-                    set_zoom(player_state, default_tile_size)
-            elif event.button in (1, 3):
-                warn_timer, changed = handle_dig_build(event, player_state, warn_timer, WARN_DURATION)
-                if changed:
-                    block_changed = True
-    return warn_timer, block_changed
\ No newline at end of file
+    if snapshot['quit']:
+        world.shutdown_workers()
+        world.save_world()
+        pygame.quit()
+        sys.exit()
+
+    if snapshot['wheel']:
+        desired = assets.TILE_SIZE + snapshot['wheel'] * settings.ZOOM_STEP_PX
+        new_size = max(min_px, min(max_px, desired))
+        if new_size != assets.TILE_SIZE:
+            set_zoom(player_state, new_size)
+            view_state = player_state
+
+    for key in snapshot['keys_down']:
+        if key == pygame.K_F3:
+            profiler.hud_visible = not profiler.hud_visible
+        elif key == pygame.K_F4:
+            # The HUD lists the file written
+            profiler.dump_csv()
+            profiler.hud_visible = True
+        elif key == pygame.K_m:
+            settings.MINIMAP_VISIBLE = not settings.MINIMAP_VISIBLE
+        elif key == pygame.K_l:
+            settings.LIGHTING_ENABLED = not settings.LIGHTING_ENABLED
+
+    keys = snapshot['keys']
+    for button, pos in snapshot['clicks']:
+        if button == 2:
+            if assets.TILE_SIZE != default_tile_size:
+                set_zoom(player_state, default_tile_size)
+                view_state = player_state
+        elif button == 1 and (keys[pygame.K_LCTRL] or keys[pygame.K_RCTRL]):
+            player.move_to(player_state, screen_to_tile(view_state, pos))
+        elif button in (1, 3):
+            pending_actions.append((button, *screen_to_tile(view_state, pos)))
@@ -0,0 +1,242 @@
+# lighting.py
+
+import numpy as np
+import pygame
+from engine import settings
+from game import world
+from typing import List, Optional, Tuple
+
+# ──────────────────────────────────────────────────────────────
+# Tile Light Map
+# ──────────────────────────────────────────────────────────────
+#
+# Torch light is computed per tile, not per pixel. Every torch in the wall
+# layer seeds its tile with its reach in tiles, then light floods outwards
+# through non-wall tiles, losing 1 per straight step and sqrt(2) per
+# diagonal one. Walls are lit by their neighbours but pass no light on, so
+# they cast shadows; unloaded tiles count as walls. The flood is a few
+# whole-array passes over the tiles in view plus a margin of the torch
+# reach, however many torches there are.
+#
+# The player carries a round glow instead, a sprite built once per zoom
+# that stays centred on the player and is combined with the torch light by
+# taking the brighter of the two.
+
+_DIAGONAL = np.float32(np.sqrt(2))
+
+def light_map(x0: int, y0: int, w: int, h: int) -> np.ndarray:
+    """
+    Return the torch light level (remaining reach in tiles, 0 = unlit) of
+    each tile in the world tile rect as an (h, w) float32 array.
+    """
+    r = settings.TORCH_LIGHT_TILES
+    walls = world.read_region(world.LAYER_WALL, x0 - r, y0 - r, w + 2 * r, h + 2 * r, settings.TILE_DIRT)
+    open_ = walls != settings.TILE_DIRT
+    level = np.where(walls == settings.TILE_TORCH, np.float32(r), np.float32(0))
+
+    # Each pass carries light one tile further, so `r` passes reach as far
+    # as any torch can
+    for _ in range(r):
+        src = np.pad(np.where(open_, level, 0), 1)
+        straight = np.maximum.reduce([src[:-2, 1:-1], src[2:, 1:-1], src[1:-1, :-2], src[1:-1, 2:]])
+        diagonal = np.maximum.reduce([src[:-2, :-2], src[:-2, 2:], src[2:, :-2], src[2:, 2:]])
+        level = np.maximum(level, np.maximum(straight - 1, diagonal - _DIAGONAL))
+    return level[r:r + h, r:r + w]
+
+def _brightness(level: np.ndarray) -> np.ndarray:
+    """
+    Overlay grey level: 255 - MAX_DARKNESS unlit, 255 (unchanged) at
+    LIGHT_RADIUS_TILES or more.
+    """
+    lit = np.clip(level / settings.LIGHT_RADIUS_TILES, 0, 1)
+    return (255 - settings.MAX_DARKNESS * (1 - lit)).astype(np.uint8)
+
+# ──────────────────────────────────────────────────────────────
+# Darkness Overlay
+# ──────────────────────────────────────────────────────────────
+#
+# The torch light of a window of tiles around the view is upscaled into a
+# grey overlay that is multiplied onto the scene. Its pixel (0, 0) sits at
+# the centre of the window's first tile and it is ts px per tile, so it
+# can be patched: a block of tiles smoothscaled to (n - 1) * ts + 1 px
+# lands on the same pixels as the whole window would, give or take
+# rounding. Only tiles whose light changed are rescaled: those hit by wall
+# edits in range, and the strips a camera move brings into the window,
+# which is scrolled by whole tiles. Most frames cost one blit.
+
+# Spare tiles kept around the view on each side before the window scrolls
+_MARGIN = 2
+
+# Torch light overlay, the world tile rect whose centres it spans, that
+# rect's grey levels and the (ts, wall versions) they were built from
+_overlay: Optional[pygame.Surface] = None
+_overlay_tiles: Tuple[int, int, int, int] = (0, 0, 0, 0)
+_overlay_grey: Optional[np.ndarray] = None
+_overlay_key: Optional[tuple] = None
+
+# Player glow for tile size _glow_ts, and scratch space the size of it
+_glow: Optional[pygame.Surface] = None
+_glow_ts: int = None
+_glow_scratch: Optional[pygame.Surface] = None
+
+def _view_tiles(ts: int, cam_x: int, cam_y: int, border: int) -> Tuple[int, int, int, int]:
+    """World tile rect covering the screen plus `border` tiles all round."""
+    x0 = (-cam_x) // ts - border
+    y0 = (-cam_y) // ts - border
+    x1 = (settings.SCREEN_W - 1 - cam_x) // ts + border
+    y1 = (settings.SCREEN_H - 1 - cam_y) // ts + border
+    return x0, y0, x1 - x0 + 1, y1 - y0 + 1
+
+def _covers(outer: Tuple[int, int, int, int], inner: Tuple[int, int, int, int]) -> bool:
+    """True if tile rect `outer` contains tile rect `inner`."""
+    return (outer[0] <= inner[0] and outer[1] <= inner[1]
+            and inner[0] + inner[2] <= outer[0] + outer[2]
+            and inner[1] + inner[3] <= outer[1] + outer[3])
+
+def _wall_versions(x0: int, y0: int, w: int, h: int) -> tuple:
+    """Wall version stamps (None if unloaded) of the chunks the light map reads."""
+    r, size = settings.TORCH_LIGHT_TILES, settings.CHUNK_SIZE
+    cx0, cy0 = (x0 - r) // size, (y0 - r) // size
+    cx1, cy1 = (x0 + w + r - 1) // size, (y0 + h + r - 1) // size
+    return tuple(
+        world.wall_versions.get((cx, cy))
+        for cy in range(cy0, cy1 + 1)
+        for cx in range(cx0, cx1 + 1)
+    )
+
+def _window(ts: int, cam_x: int, cam_y: int) -> Tuple[int, int, int, int]:
+    """
+    Overlay window for the view: _MARGIN tiles beyond it all round, sized
+    by the screen alone so every window at one zoom is the same size.
+    """
+    return ((-cam_x) // ts - _MARGIN, (-cam_y) // ts - _MARGIN,
+            settings.SCREEN_W // ts + 2 + 2 * _MARGIN, settings.SCREEN_H // ts + 2 + 2 * _MARGIN)
+
+def _patch(ts: int, x0: int, y0: int, x1: int, y1: int) -> Tuple[int, int, int, int]:
+    """
+    Rescale the overlay wherever the window tiles x0..x1, y0..y1 (inclusive)
+    blend in, i.e. out to the centres of their neighbours. Returns the
+    world tile rect redrawn.
+    """
+    h, w = _overlay_grey.shape
+    x0, y0 = max(x0 - 1, 0), max(y0 - 1, 0)
+    x1, y1 = min(x1 + 1, w - 1), min(y1 + 1, h - 1)
+    grey = _overlay_grey[y0:y1 + 1, x0:x1 + 1]
+    small = pygame.surfarray.make_surface(np.repeat(grey.T[:, :, None], 3, axis=2)).convert()
+    size = ((x1 - x0) * ts + 1, (y1 - y0) * ts + 1)
+    _overlay.blit(pygame.transform.smoothscale(small, size), (x0 * ts, y0 * ts))
+    return _overlay_tiles[0] + x0, _overlay_tiles[1] + y0, x1 - x0 + 1, y1 - y0 + 1
+
+def _patch_changed(ts: int, changed: np.ndarray) -> list:
+    """Patch the bounding box of the window tiles set in `changed`, if any."""
+    ys, xs = np.nonzero(changed)
+    if not len(xs):
+        return []
+    return [_patch(ts, int(xs.min()), int(ys.min()), int(xs.max()), int(ys.max()))]
+
+def update(ts: int, cam_x: int, cam_y: int) -> List[Optional[Tuple[int, int, int, int]]]:
+    """
+    Bring the darkness overlay up to date for this frame's view. Returns the
+    world tile rects whose lighting on screen may have changed, in the form
+    of world.take_changes(): empty if none, a lone None if all of it.
+    """
+    global _overlay, _overlay_tiles, _overlay_grey, _overlay_key
+    if not settings.LIGHTING_ENABLED:
+        changed = _overlay_key is not None
+        _overlay, _overlay_grey, _overlay_key = None, None, None
+        return [None] if changed else []
+    _update_glow(ts)
+
+    window = _window(ts, cam_x, cam_y)
+    x0, y0, w, h = window
+    if _overlay_key is not None and _overlay_key[0] == ts and _covers(_overlay_tiles, _view_tiles(ts, cam_x, cam_y, 1)):
+        versions = _wall_versions(*_overlay_tiles)
+        if versions == _overlay_key[1]:
+            return []
+        # Walls changed in range: rescale the tiles whose light changed
+        old = _overlay_grey
+        _overlay_grey = _brightness(light_map(*_overlay_tiles))
+        _overlay_key = (ts, versions)
+        return _patch_changed(ts, _overlay_grey != old)
+
+    old, old_tiles = _overlay_grey, _overlay_tiles
+    dx, dy = x0 - old_tiles[0], y0 - old_tiles[1]
+    _overlay_tiles = window
+    _overlay_grey = _brightness(light_map(*window))
+    _overlay_key = (ts, _wall_versions(*window))
+    if old is None or old.shape != (h, w) or old_tiles[2:] != window[2:] or abs(dx) >= w or abs(dy) >= h:
+        _overlay = pygame.Surface(((w - 1) * ts + 1, (h - 1) * ts + 1)).convert()
+        _patch(ts, 0, 0, w - 1, h - 1)
+        return [None]
+
+    # The camera left the window: scroll it by whole tiles and fill in the
+    # strips brought in, then anything that changed meanwhile
+    _overlay.scroll(-dx * ts, -dy * ts)
+    if dx:
+        _patch(ts, w - dx if dx > 0 else 0, 0, w - 1 if dx > 0 else -dx - 1, h - 1)
+    if dy:
+        _patch(ts, 0, h - dy if dy > 0 else 0, w - 1, h - 1 if dy > 0 else -dy - 1)
+    kept = old[max(dy, 0):h + min(dy, 0), max(dx, 0):w + min(dx, 0)]
+    changed = np.zeros((h, w), dtype=bool)
+    changed[max(-dy, 0):h - max(dy, 0), max(-dx, 0):w - max(dx, 0)] = (
+        _overlay_grey[max(-dy, 0):h - max(dy, 0), max(-dx, 0):w - max(dx, 0)] != kept)
+    _patch_changed(ts, changed)
+    return [None]
+
+def _update_glow(ts: int) -> None:
+    """Build the player glow for tile size `ts` if it is not built yet."""
+    global _glow, _glow_ts, _glow_scratch
+    if _glow_ts == ts:
+        return
+    # One quadrant of distances from the centre in tiles, mirrored
+    r = settings.LIGHT_RADIUS_TILES
+    d = (np.arange(r * ts, dtype=np.float32) + 0.5) / ts
+    quarter = _brightness(r - np.hypot(d[:, None], d[None, :]))
+    half = np.concatenate([quarter[::-1], quarter])
+    grey = np.concatenate([half[:, ::-1], half], axis=1)
+    _glow = pygame.surfarray.make_surface(np.repeat(grey[:, :, None], 3, axis=2)).convert()
+    _glow_scratch = _glow.copy()
+    _glow_ts = ts
+
+def _glow_rect(ts: int) -> pygame.Rect:
+    """Screen rect of the glow, centred on the player sprite."""
+    rect = _glow.get_rect()
+    rect.center = (settings.SCREEN_W // 2 + ts // 2, settings.SCREEN_H // 2 + ts // 2)
+    return rect
+
+def draw(screen: pygame.Surface, ts: int, cam_x: int, cam_y: int, area: pygame.Rect) -> None:
+    """
+    Darken `area` of the screen by multiplying in the overlay built by
+    update(), brightened by the player glow around the player.
+    """
+    if _overlay is None:
+        return
+    pos = (_overlay_tiles[0] * ts + ts // 2 + cam_x, _overlay_tiles[1] * ts + ts // 2 + cam_y)
+    glow_rect = _glow_rect(ts)
+    lit = area.clip(glow_rect)
+
+    # Outside the glow the overlay goes on as it is
+    for part in _outside(area, lit):
+        screen.set_clip(part)
+        screen.blit(_overlay, pos, special_flags=pygame.BLEND_RGB_MULT)
+    screen.set_clip(None)
+
+    # Inside, the brighter of overlay and glow
+    if lit.width and lit.height:
+        scratch = _glow_scratch.subsurface((0, 0, lit.width, lit.height))
+        scratch.fill((255, 255, 255))
+        scratch.blit(_overlay, (pos[0] - lit.x, pos[1] - lit.y))
+        scratch.blit(_glow, (glow_rect.x - lit.x, glow_rect.y - lit.y), special_flags=pygame.BLEND_RGB_MAX)
+        screen.blit(scratch, lit, special_flags=pygame.BLEND_RGB_MULT)
+
+def _outside(area: pygame.Rect, hole: pygame.Rect) -> List[pygame.Rect]:
+    """Up to four rects covering `area` minus `hole`, a rect inside it."""
+    if not (hole.width and hole.height):
+        return [area]
+    parts = [
+        pygame.Rect(area.left, area.top, area.width, hole.top - area.top),
+        pygame.Rect(area.left, hole.bottom, area.width, area.bottom - hole.bottom),
+        pygame.Rect(area.left, hole.top, hole.left - area.left, hole.height),
+        pygame.Rect(hole.right, hole.top, area.right - hole.right, hole.height),
+    ]
+    return [p for p in parts if p.width > 0 and p.height > 0]
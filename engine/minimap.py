@@ -0,0 +1,145 @@
+# minimap.py
+
+import numpy as np
+import pygame
+from collections import OrderedDict
+from engine import settings, assets
+from game import world
+from typing import Dict, Optional, Tuple
+
+# ──────────────────────────────────────────────────────────────
+# Chunk Thumbnails
+# ──────────────────────────────────────────────────────────────
+#
+# A thumbnail is a chunk drawn at one pixel per tile in flat colours taken
+# from the tile sprites. They are rebuilt only when
+# their chunk's version stamp changes, and kept after the chunk unloads, so
+# the minimap shows everything explored. The zoomed-out renderer scales
+# them up instead of drawing sprites.
+
+# {(cx, cy): (chunk_version, surface)}, least recently used first
+_thumbs: "OrderedDict[Tuple[int, int], Tuple[int, pygame.Surface]]" = OrderedDict()
+_palette: Optional[np.ndarray] = None
+
+def _tile_palette() -> np.ndarray:
+    """RGB per tile class: 0 empty, 1 floor, 2 wall (its top face), 3 torch."""
+    global _palette
+    if _palette is None:
+        ts = assets.TILE_SIZE
+        floor = pygame.transform.average_color(assets.floor_img)[:3]
+        top = pygame.transform.average_color(assets.wall_img, (0, 0, ts, ts))[:3]
+        _palette = np.array([settings.BG_COLOR, floor, top, settings.MINIMAP_TORCH_COLOR], dtype=np.uint8)
+    return _palette
+
+def _bake_thumbnail(chunk: np.ndarray) -> pygame.Surface:
+    wall = chunk[world.LAYER_WALL]
+    floor = chunk[world.LAYER_FLOOR] == settings.TILE_DIRT
+    cls = floor.astype(np.uint8)
+    cls[wall == settings.TILE_DIRT] = 2
+    cls[wall == settings.TILE_TORCH] = 3
+    rgb = _tile_palette()[cls]
+    return pygame.surfarray.make_surface(rgb.transpose(1, 0, 2)).convert()
+
+def thumbnail(coord: Tuple[int, int], chunk: np.ndarray) -> pygame.Surface:
+    """
+    Return the thumbnail of loaded chunk `coord`, rebaking it if the chunk
+    changed. Treat the returned surface as read-only.
+    """
+    version = world.chunk_versions.get(coord)
+    cached = _thumbs.get(coord)
+    if cached is not None and cached[0] == version:
+        _thumbs.move_to_end(coord)
+        return cached[1]
+    surf = _bake_thumbnail(chunk)
+    _thumbs[coord] = (version, surf)
+    _thumbs.move_to_end(coord)
+    if len(_thumbs) > settings.THUMB_CACHE_SIZE:
+        _thumbs.popitem(last=False)
+    _paint_chunk(coord, surf)
+    return surf
+
+# ──────────────────────────────────────────────────────────────
+# Minimap
+# ──────────────────────────────────────────────────────────────
+#
+# The map is one surface MINIMAP_CHUNKS chunks across, centred on the
+# player's chunk. It is rebuilt from thumbnails when that chunk changes and
+# patched one thumbnail at a time otherwise, so a frame costs one blit plus
+# the player marker.
+
+MARGIN = 10
+TOP = 30  # below the coordinates readout
+BORDER_COLOR = (90, 90, 90)
+
+_map: pygame.Surface = None
+_map_center: Optional[Tuple[int, int]] = None
+_map_serial = 0  # bumped whenever the map surface changes
+
+def _map_origin() -> Tuple[int, int]:
+    """Chunk shown in the map's top-left corner."""
+    r = settings.MINIMAP_CHUNKS // 2
+    return _map_center[0] - r, _map_center[1] - r
+
+def _paint_chunk(coord: Tuple[int, int], thumb: pygame.Surface) -> None:
+    """Copy a rebaked thumbnail into the map if it is on it."""
+    global _map_serial
+    if _map is None or _map_center is None:
+        return
+    ox, oy = _map_origin()
+    dx, dy = coord[0] - ox, coord[1] - oy
+    if 0 <= dx < settings.MINIMAP_CHUNKS and 0 <= dy < settings.MINIMAP_CHUNKS:
+        size = settings.CHUNK_SIZE
+        _map.blit(thumb, (1 + dx * size, 1 + dy * size))
+        _map_serial += 1
+
+def _rebuild(center: Tuple[int, int]) -> None:
+    global _map, _map_center, _map_serial
+    size = settings.CHUNK_SIZE
+    span = settings.MINIMAP_CHUNKS * size
+    if _map is None or _map.get_width() != span + 2:
+        _map = pygame.Surface((span + 2, span + 2)).convert()
+    _map.fill(BORDER_COLOR)
+    _map.fill(settings.MINIMAP_FOG_COLOR, (1, 1, span, span))
+    _map_center = center
+    ox, oy = _map_origin()
+    _map.blits([
+        (cached[1], (1 + (cx - ox) * size, 1 + (cy - oy) * size))
+        for (cx, cy), cached in _thumbs.items()
+        if 0 <= cx - ox < settings.MINIMAP_CHUNKS and 0 <= cy - oy < settings.MINIMAP_CHUNKS
+    ], False)
+    _map_serial += 1
+
+def update(chunks: Dict[Tuple[int, int], np.ndarray], player: dict) -> None:
+    """
+    Bring thumbnails of loaded chunks up to date and recentre the map on
+    the player's chunk. Call once per frame before drawing.
+    """
+    for coord, version in world.chunk_versions.items():
+        cached = _thumbs.get(coord)
+        if cached is None or cached[0] != version:
+            thumbnail(coord, chunks[coord])
+    center = (player['tx'] // settings.CHUNK_SIZE, player['ty'] // settings.CHUNK_SIZE)
+    if center != _map_center or _map is None:
+        _rebuild(center)
+
+def rect() -> pygame.Rect:
+    """Screen rect the minimap occupies, border included."""
+    span = settings.MINIMAP_CHUNKS * settings.CHUNK_SIZE
+    return pygame.Rect(MARGIN - 1, TOP - 1, span + 2, span + 2)
+
+def state_key(player: dict) -> Optional[tuple]:
+    """Changes whenever the drawn minimap would; None when it is hidden."""
+    if not settings.MINIMAP_VISIBLE:
+        return None
+    return (_map_serial, player['tx'], player['ty'])
+
+def draw(screen: pygame.Surface, player: dict) -> None:
+    """Draw the minimap with the player marked, if visible."""
+    if not settings.MINIMAP_VISIBLE or _map is None:
+        return
+    ox, oy = _map_origin()
+    size = settings.CHUNK_SIZE
+    screen.blit(_map, (MARGIN - 1, TOP - 1))
+    px = MARGIN + player['tx'] - ox * size
+    py = TOP + player['ty'] - oy * size
+    screen.fill((255, 60, 60), (px - 1, py - 1, 3, 3))
@@ -0,0 +1,190 @@
+# profiler.py
+
+import time
+import numpy as np
+import pygame
+from engine import settings
+from typing import Dict, Optional
+
+# ──────────────────────────────────────────────────────────────
+# Phases & Ring Buffer
+# ──────────────────────────────────────────────────────────────
+#
+# Each frame is split into PHASES by lap marks: mark(phase) charges the time
+# since the previous mark (or begin_frame) to `phase`, so the phases add up
+# to the frame. NESTED phases are timed inside other phases with add() and
+# are shown separately but not stacked. The last PROFILER_FRAMES frames are
+# kept in a ring buffer, one row per frame: total, then PHASES, then NESTED.
+
+PHASES = ('events', 'sim', 'chunks', 'minimap', 'lighting', 'floors', 'walls', 'overlay', 'hud', 'flip')
+NESTED = ('depths',)  # wall depth refreshes, inside sim and chunks
+COLUMNS = ('total',) + PHASES + NESTED
+
+PHASE_COLORS = (
+    (90, 160, 255), (80, 220, 220), (240, 200, 60), (230, 110, 170),
+    (250, 240, 150), (150, 110, 70), (210, 120, 60), (180, 120, 230),
+    (120, 120, 120), (90, 210, 110),
+)
+
+_col = {name: i for i, name in enumerate(COLUMNS)}
+_samples = np.zeros((settings.PROFILER_FRAMES, len(COLUMNS)), dtype=np.float64)
+_head = 0    # next row to write
+_count = 0   # rows filled so far
+_total = 0   # frames ever stored
+_frame = np.zeros(len(COLUMNS), dtype=np.float64)
+_frame_start = 0.0
+_lap = 0.0
+
+hud_visible = False
+
+GRAPH_HEIGHT = 100
+
+_hud_font: pygame.font.Font = None
+_hud_lines: list = []
+_hud_age = 0
+_dump_path: Optional[str] = None  # last CSV written, listed under the HUD
+_graph: pygame.Surface = None
+_graph_total = 0  # _total when the graph was last brought up to date
+
+# ──────────────────────────────────────────────────────────────
+# Timing
+# ──────────────────────────────────────────────────────────────
+
+def begin_frame() -> None:
+    """Start timing a frame."""
+    global _frame_start, _lap
+    _frame[:] = 0.0
+    _frame_start = _lap = time.perf_counter()
+
+def mark(phase: str) -> None:
+    """Charge the time since the last mark to `phase`."""
+    global _lap
+    now = time.perf_counter()
+    _frame[_col[phase]] += now - _lap
+    _lap = now
+
+def add(phase: str, seconds: float) -> None:
+    """Add time measured by the caller to a nested phase."""
+    _frame[_col[phase]] += seconds
+
+def end_frame() -> None:
+    """Store the frame's timings in the ring buffer."""
+    global _head, _count, _total
+    _frame[0] = time.perf_counter() - _frame_start
+    _samples[_head] = _frame
+    _head = (_head + 1) % len(_samples)
+    _count = min(_count + 1, len(_samples))
+    _total += 1
+
+def recent(n: Optional[int] = None) -> np.ndarray:
+    """Return the last `n` (default all) stored frames, oldest first, in ms."""
+    n = _count if n is None else min(n, _count)
+    idx = (np.arange(_head - n, _head)) % len(_samples)
+    return _samples[idx] * 1000.0
+
+def averages(n: int = None) -> Dict[str, float]:
+    """Rolling average ms per column over the last `n` frames."""
+    rows = recent(n or settings.PROFILER_AVG_FRAMES)
+    if not len(rows):
+        return {name: 0.0 for name in COLUMNS}
+    return dict(zip(COLUMNS, rows.mean(axis=0).tolist()))
+
+# ──────────────────────────────────────────────────────────────
+# CSV Export
+# ──────────────────────────────────────────────────────────────
+
+def dump_csv(path: str = None) -> str:
+    """
+    Write the ring buffer (ms, oldest first) to a CSV file and return its
+    path, which the HUD shows from the next refresh on.
+    """
+    global _dump_path, _hud_age
+    if path is None:
+        path = time.strftime("profile-%Y%m%d-%H%M%S.csv")
+    rows = recent()
+    with open(path, "w") as f:
+        f.write("frame," + ",".join(f"{name}_ms" for name in COLUMNS) + "\n")
+        for i, row in enumerate(rows):
+            f.write(f"{i}," + ",".join(f"{v:.4f}" for v in row) + "\n")
+    _dump_path, _hud_age = path, 0
+    return path
+
+# ──────────────────────────────────────────────────────────────
+# HUD
+# ──────────────────────────────────────────────────────────────
+
+def _graph_pixels(rows: np.ndarray) -> np.ndarray:
+    """
+    Stacked bar graph of per-phase ms as a [x, y] RGB array, one column per
+    frame, scaled so the frame budget (1 / FPS) sits at half height.
+    """
+    budget = 1000.0 / settings.FPS
+    px_per_ms = GRAPH_HEIGHT / (2 * budget)
+    tops = np.cumsum(rows[:, 1:1 + len(PHASES)], axis=1) * px_per_ms  # (frames, phases)
+    y = np.arange(GRAPH_HEIGHT)[::-1, None]  # pixel height above the baseline, per row
+
+    rgb = np.zeros((GRAPH_HEIGHT, len(rows), 3), dtype=np.uint8)
+    rgb[:] = (25, 25, 25)
+    bottom = np.zeros(len(rows))
+    for p, color in enumerate(PHASE_COLORS):
+        rgb[(y >= bottom) & (y < tops[:, p])] = color
+        bottom = tops[:, p]
+    rgb[GRAPH_HEIGHT - 1 - int(budget * px_per_ms)] = (255, 60, 60)  # budget line
+    return rgb.transpose(1, 0, 2)
+
+def _update_graph() -> None:
+    """
+    Bring the graph up to date: scroll it left and draw only the frames
+    stored since the last update, or rebuild it after a long gap.
+    """
+    global _graph, _graph_total
+    width = settings.PROFILER_GRAPH_FRAMES
+    new = _total - _graph_total
+    if _graph is None or new >= width:
+        pixels = np.zeros((width, GRAPH_HEIGHT, 3), dtype=np.uint8)
+        rows = recent(width)
+        pixels[width - len(rows):] = _graph_pixels(rows)
+        _graph = pygame.surfarray.make_surface(pixels)
+    elif new:
+        _graph.scroll(-new, 0)
+        pygame.surfarray.blit_array(
+            _graph.subsurface((width - new, 0, new, GRAPH_HEIGHT)),
+            _graph_pixels(recent(new)))
+    _graph_total = _total
+
+def draw_hud(screen: pygame.Surface) -> Optional[pygame.Rect]:
+    """
+    Draw rolling phase averages and the frame-time graph, if visible.
+    Returns the screen rect drawn, or None.
+    """
+    global _hud_font, _hud_lines, _hud_age
+    if not hud_visible or not _count:
+        return None
+    if _hud_font is None:
+        _hud_font = pygame.font.SysFont(None, 18)
+
+    # Text only changes a few times a second to stay readable and cheap
+    _hud_age -= 1
+    if _hud_age <= 0 or not _hud_lines:
+        _hud_age = settings.PROFILER_HUD_REFRESH
+        avg = averages()
+        lines = [(f"frame {avg['total']:6.2f} ms  (budget {1000.0 / settings.FPS:.1f})", (255, 255, 255))]
+        lines += [(f"{name:<8} {avg[name]:6.2f}", color) for name, color in zip(PHASES, PHASE_COLORS)]
+        lines += [(f"  {name:<6} {avg[name]:6.2f}", (200, 200, 200)) for name in NESTED]
+        if _dump_path is not None:
+            lines.append((f"saved {_dump_path}", (200, 200, 200)))
+        _hud_lines = [_hud_font.render(text, True, color) for text, color in lines]
+
+    _update_graph()
+    graph = _graph
+    line_h = _hud_lines[0].get_height()
+    x = settings.SCREEN_W - graph.get_width() - 10
+    y = 40
+    panel = pygame.Rect(x - 6, y - 6, graph.get_width() + 12, graph.get_height() + len(_hud_lines) * line_h + 16)
+    screen.fill((0, 0, 0), panel)
+    screen.blit(graph, (x, y))
+    y += graph.get_height() + 4
+    for surf in _hud_lines:
+        screen.blit(surf, (x, y))
+        y += line_h
+    return panel
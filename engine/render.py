@@ -1,13 +1,41 @@
+import math
+import numpy as np
 import pygame
-from engine import settings, assets
+from engine import settings, assets, profiler, text, minimap, lighting
+from game import world
+from typing import Dict, Tuple, List, Optional
 
 # ──────────────────────────────────────────────────────────────
 # Globals
 # ──────────────────────────────────────────────────────────────
 
 _font: pygame.font.Font = None
-_radial_mask: pygame.Surface = None
-_current_radius_px: int = None
+
+# Pre-rendered floor layer per chunk, or the whole chunk at LOD zoom:
+# {(cx, cy): [chunk_version, surface, tile rows baked so far]}
+_floor_cache: Dict[Tuple[int, int], list] = {}
+_floor_cache_ts: int = None
+
+# Composited hotbar and the (hotbar list, hotbar_version, selected_slot) it
+# shows; scaled icons per item type
+_hotbar_surface: pygame.Surface = None
+_hotbar_key: tuple = None
+_hotbar_icons: Dict[str, pygame.Surface] = {}
+
+# Dirty-rect state: what the last frame showed, the screen rects present()
+# should push (None for the whole screen) and overlay rects drawn on top of
+# the scene this frame and last frame
+_last_view: tuple = None
+_last_hotbar: tuple = None
+_last_minimap: tuple = None
+_update_rects: Optional[List[pygame.Rect]] = None
+_overlays: List[pygame.Rect] = []
+_prev_overlays: List[pygame.Rect] = []
+
+# Scroll-reuse state: the world layer (no player or overlays) of the last
+# frame and the view it was drawn for
+_scroll_buffer: pygame.Surface = None
+_scroll_view: tuple = None
 
 # ──────────────────────────────────────────────────────────────
 # Initialization
@@ -18,184 +46,505 @@ def init_render() -> None:
     global _font
     _font = pygame.font.SysFont(None, 18)
 
-# ──────────────────────────────────────────────────────────────
-# Radial Mask Utilities
-# ──────────────────────────────────────────────────────────────
-
-def _make_radial_mask(radius: int) -> pygame.Surface:
-    """Create a radial darkness mask with smooth falloff."""
-    size = radius * 2
-    surf = pygame.Surface((size, size), flags=pygame.SRCALPHA)
-    max_a = settings.MAX_DARKNESS
-    cx = cy = radius
-    for y in range(size):
-        for x in range(size):
-            dx, dy = x - cx, y - cy
-            d = (dx * dx + dy * dy) ** 0.5
-            if d < radius:
-                a = int(max_a * (1 - d / radius))
-                surf.set_at((x, y), (0, 0, 0, a))
-    return surf
-
-def _ensure_radial_mask() -> None:
-    """Ensure the radial mask matches the current zoom."""
-    global _radial_mask, _current_radius_px
-    ts = assets.TILE_SIZE
-    radius_px = settings.LIGHT_RADIUS_TILES * ts
-    if radius_px != _current_radius_px:
-        _radial_mask = _make_radial_mask(radius_px)
-        _current_radius_px = radius_px
-
 # ──────────────────────────────────────────────────────────────
 # Hotbar Rendering
 # ──────────────────────────────────────────────────────────────
 
-def draw_hotbar(screen: pygame.Surface, player: dict) -> None:
-    """Draw the player's hotbar."""
+def hotbar_rect() -> pygame.Rect:
+    """Screen area covered by the hotbar."""
     slots, sz, pad = settings.HOTBAR_SLOTS, settings.HOTBAR_SLOT_SIZE, settings.HOTBAR_PADDING
     total = slots * sz + (slots - 1) * pad
-    x0 = (settings.SCREEN_W - total) // 2
-    y0 = settings.SCREEN_H - sz - 10
+    return pygame.Rect((settings.SCREEN_W - total) // 2, settings.SCREEN_H - sz - 10, total, sz)
+
+def draw_hotbar(screen: pygame.Surface, player: dict) -> None:
+    """Draw the player's hotbar: one blit of its cached surface."""
+    global _hotbar_surface, _hotbar_key
+    key = (id(player['hotbar']), player['hotbar_version'], player['selected_slot'])
+    if _hotbar_surface is None or key != _hotbar_key:
+        _hotbar_surface = _build_hotbar(player)
+        _hotbar_key = key
+    screen.blit(_hotbar_surface, hotbar_rect())
+
+def _build_hotbar(player: dict) -> pygame.Surface:
+    """Composite all hotbar slots, icons and counts into one surface."""
+    slots, sz, pad = settings.HOTBAR_SLOTS, settings.HOTBAR_SLOT_SIZE, settings.HOTBAR_PADDING
+    surf = pygame.Surface(hotbar_rect().size, flags=pygame.SRCALPHA)
     for i in range(slots):
-        x = x0 + i * (sz + pad)
-        rect = pygame.Rect(x, y0, sz, sz)
-        pygame.draw.rect(screen, (50, 50, 50), rect)
+        x = i * (sz + pad)
+        rect = pygame.Rect(x, 0, sz, sz)
+        pygame.draw.rect(surf, (50, 50, 50), rect)
         color = (200, 200, 50) if i == player['selected_slot'] else (100, 100, 100)
-        pygame.draw.rect(screen, color, rect, 3 if i == player['selected_slot'] else 1)
+        pygame.draw.rect(surf, color, rect, 3 if i == player['selected_slot'] else 1)
         itm = player['hotbar'][i]
         if itm:
-            icon = pygame.transform.scale(itm['image'], (sz - 8, sz - 8))
-            screen.blit(icon, (x + 4, y0 + 4))
-            cnt = _font.render(str(itm['count']), True, (255, 255, 255))
-            cw, ch = cnt.get_size()
-            screen.blit(cnt, (x + sz - cw - 4, y0 + sz - ch - 4))
+            surf.blit(_hotbar_icon(itm), (x + 4, 4))
+            count = str(itm['count'])
+            cw, ch = text.glyphs_size(_font, count, (255, 255, 255))
+            text.draw_glyphs(surf, _font, count, (255, 255, 255), (x + sz - cw - 4, sz - ch - 4))
+    return surf
+
+def _hotbar_icon(itm: dict) -> pygame.Surface:
+    """Return the item's image scaled to a hotbar icon, cached per item type."""
+    icon = _hotbar_icons.get(itm['type'])
+    if icon is None:
+        sz = settings.HOTBAR_SLOT_SIZE - 8
+        icon = pygame.transform.scale(itm['image'], (sz, sz))
+        _hotbar_icons[itm['type']] = icon
+    return icon
+
+# ──────────────────────────────────────────────────────────────
+# Floor Layer Cache
+# ──────────────────────────────────────────────────────────────
+
+def _blit_floor(screen: pygame.Surface, floor: np.ndarray, ox: int, oy: int, ts: int, area: pygame.Rect) -> None:
+    """
+    Blit the floor tiles of one chunk, drawn at (ox, oy), that overlap
+    `area` onto `screen`, which is already filled with the background there.
+    """
+    size = settings.CHUNK_SIZE
+    lx0, ly0 = max((area.left - ox) // ts, 0), max((area.top - oy) // ts, 0)
+    lx1, ly1 = min((area.right - 1 - ox) // ts + 1, size), min((area.bottom - 1 - oy) // ts + 1, size)
+    img = assets.floor_img
+    lys, lxs = np.nonzero(floor[ly0:ly1, lx0:lx1] == settings.TILE_DIRT)
+    screen.blits([(img, (ox + (lx0 + lx) * ts, oy + (ly0 + ly) * ts))
+                  for ly, lx in zip(lys.tolist(), lxs.tolist())], False)
+
+def _paint_floor(surf: pygame.Surface, floor: np.ndarray, ts: int, rect: pygame.Rect) -> None:
+    """Repaint the tile aligned `rect` of a chunk's baked floor surface."""
+    surf.fill(settings.BG_COLOR, rect)
+    _blit_floor(surf, floor, 0, 0, ts, rect)
+
+def _lod(ts: int) -> bool:
+    """True if tiles of size `ts` are drawn from chunk thumbnails."""
+    return ts * settings.LOD_TILES_ACROSS < settings.SCREEN_W
+
+def _screen_chunks(ts: int, cam_x: int, cam_y: int) -> Tuple[int, int, int, int]:
+    """Chunk range (cx0, cy0, cx1, cy1), inclusive, overlapping the screen."""
+    span = settings.CHUNK_SIZE * ts
+    return ((-cam_x) // span, (-cam_y) // span,
+            (settings.SCREEN_W - 1 - cam_x) // span, (settings.SCREEN_H - 1 - cam_y) // span)
+
+def _update_floors(
+    screen: pygame.Surface,
+    chunks: dict,
+    ts: int,
+    cam_x: int,
+    cam_y: int,
+    changes: list
+) -> None:
+    """
+    Bring the floor cache up to date before drawing. It is dropped on zoom
+    change, and entries once their chunk scrolls more than one chunk off
+    screen. Tiles in `changes` are repainted into baked floors of edited
+    chunks, so a dig costs one tile rather than a rebake. Then up to
+    FLOOR_BAKE_PX pixels of floor on screen are baked, a few tile
+    rows at a time, so a zoom spreads the work over frames; floors not
+    baked yet are blitted per tile. Baked surfaces are limited to
+    FLOOR_CACHE_MAX_MB, off-screen ones making way first; zoomed in so far
+    that the chunks on screen alone exceed it, nothing is baked.
+    """
+    global _floor_cache_ts
+    if _floor_cache_ts != ts:
+        _floor_cache.clear()
+        _floor_cache_ts = ts
+
+    size = settings.CHUNK_SIZE
+    span = size * ts
+    cx0, cy0, cx1, cy1 = _screen_chunks(ts, cam_x, cam_y)
+    for key in list(_floor_cache):
+        kx, ky = key
+        if key not in chunks or not (cx0 - 1 <= kx <= cx1 + 1 and cy0 - 1 <= ky <= cy1 + 1):
+            del _floor_cache[key]
+    if _lod(ts):
+        return  # thumbnails are scaled up as they are drawn
+
+    capacity = settings.FLOOR_CACHE_MAX_MB * 1024 * 1024 // (span * span * screen.get_bytesize())
+    if capacity < (cx1 - cx0 + 1) * (cy1 - cy0 + 1):
+        _floor_cache.clear()
+        return
+
+    # Edited chunks: repaint the changed tiles of the rows baked so far. If
+    # the changes are incomplete the entry stays stale and is rebaked.
+    if None not in changes:
+        for (cx, cy), entry in _floor_cache.items():
+            version = world.chunk_versions.get((cx, cy))
+            if entry[0] == version:
+                continue
+            baked = pygame.Rect(0, 0, span, entry[2] * ts)
+            for x0, y0, w, h in changes:
+                rect = pygame.Rect((x0 - cx * size) * ts, (y0 - cy * size) * ts, w * ts, h * ts).clip(baked)
+                if rect.width and rect.height:
+                    _paint_floor(entry[1], chunks[(cx, cy)][world.LAYER_FLOOR], ts, rect)
+            entry[0] = version
+
+    budget = settings.FLOOR_BAKE_PX
+    row_px = span * ts  # pixels in one tile row of a chunk
+    for cy in range(cy0, cy1 + 1):
+        for cx in range(cx0, cx1 + 1):
+            chunk = chunks.get((cx, cy))
+            # At least one row a frame, however large
+            if chunk is None or budget < min(row_px, settings.FLOOR_BAKE_PX):
+                continue
+            version = world.chunk_versions.get((cx, cy))
+            entry = _floor_cache.get((cx, cy))
+            if entry is not None and entry[0] == version and entry[2] == size:
+                continue
+            if entry is None:
+                if len(_floor_cache) >= capacity:
+                    # Full: drop a chunk off screen; those on screen always fit
+                    for kx, ky in _floor_cache:
+                        if not (cx0 <= kx <= cx1 and cy0 <= ky <= cy1):
+                            del _floor_cache[(kx, ky)]
+                            break
+                entry = _floor_cache[(cx, cy)] = [version, pygame.Surface((span, span), 0, screen), 0]
+            elif entry[0] != version:
+                entry[0], entry[2] = version, 0
+            rows = min(size - entry[2], max(1, budget // row_px))
+            _paint_floor(entry[1], chunk[world.LAYER_FLOOR], ts, pygame.Rect(0, entry[2] * ts, span, rows * ts))
+            entry[2] += rows
+            budget -= rows * row_px
+
+def _draw_floors(
+    screen: pygame.Surface,
+    chunks: dict,
+    ts: int,
+    cam_x: int,
+    cam_y: int,
+    area: pygame.Rect
+) -> None:
+    """
+    Draw the floor of every chunk overlapping `area` from its baked surface
+    if it is complete and current, otherwise tile by tile; see
+    _update_floors. At LOD zoom the surface is the chunk's thumbnail scaled
+    up, walls and torches included, and is made here when stale.
+    """
+    size = settings.CHUNK_SIZE
+    span = size * ts
+    for cy in range((area.top - cam_y) // span, (area.bottom - 1 - cam_y) // span + 1):
+        for cx in range((area.left - cam_x) // span, (area.right - 1 - cam_x) // span + 1):
+            chunk = chunks.get((cx, cy))
+            if chunk is None:
+                continue
+            version = world.chunk_versions.get((cx, cy))
+            entry = _floor_cache.get((cx, cy))
+            if _lod(ts) and (entry is None or entry[0] != version):
+                surf = pygame.transform.scale(minimap.thumbnail((cx, cy), chunk), (span, span))
+                entry = _floor_cache[(cx, cy)] = [version, surf, size]
+            if entry is not None and entry[0] == version and entry[2] == size:
+                screen.blit(entry[1], (cx * span + cam_x, cy * span + cam_y))
+            else:
+                _blit_floor(screen, chunk[world.LAYER_FLOOR], cx * span + cam_x, cy * span + cam_y, ts, area)
 
 # ──────────────────────────────────────────────────────────────
 # World Rendering
 # ──────────────────────────────────────────────────────────────
 
+def _camera(player: dict) -> Tuple[int, int]:
+    """Return the integer screen position of world pixel (0, 0)."""
+    cam_x = math.floor(settings.SCREEN_W // 2 - player['px'])
+    cam_y = math.floor(settings.SCREEN_H // 2 - player['py'])
+    return cam_x, cam_y
+
 def draw_world(
+    screen: pygame.Surface,
+    player: dict,
+    chunks: dict
+) -> None:
+    """Redraw the whole scene."""
+    _update_floors(screen, chunks, assets.TILE_SIZE, *_camera(player), world.take_changes())
+    lighting.update(assets.TILE_SIZE, *_camera(player))
+    _draw_scene(screen, player, chunks, screen.get_rect())
+
+def _draw_scene(
     screen: pygame.Surface,
     player: dict,
     chunks: dict,
-    wall_depths: dict
+    area: pygame.Rect
 ) -> None:
+    """
+    Draw everything that falls inside `area`, clipped to it. Each layer is
+    drawn in full painter's order, so the result matches a full redraw.
+    """
+    _draw_world_layer(screen, player, chunks, area, True)
+    lighting.draw(screen, assets.TILE_SIZE, *_camera(player), area)
+    screen.set_clip(area)
+    _draw_overlay(screen, player)
+    screen.set_clip(None)
+
+def _draw_world_layer(
+    surface: pygame.Surface,
+    player: dict,
+    chunks: dict,
+    area: pygame.Rect,
+    with_player: bool
+) -> None:
+    """
+    Draw background, floors, walls and (optionally) the player inside
+    `area`, clipped to it.
+    """
     ts = assets.TILE_SIZE
     wall_h = assets.WALL_HEIGHT
-    cam_x = settings.SCREEN_W // 2 - player['px']
-    cam_y = settings.SCREEN_H // 2 - player['py']
+    cam_x, cam_y = _camera(player)
+    surface.set_clip(area)
 
     # 1) Draw background
-    screen.fill((20, 20, 30))
-
-    # 2) Collect drawables (floors, player, walls) with their y-sorting key
-    drawables = []
-
-    # Floor tiles
-    for (cx, cy), (floor, wall) in chunks.items():
-        bx = cx * settings.CHUNK_SIZE * ts + cam_x
-        by = cy * settings.CHUNK_SIZE * ts + cam_y
-        for ly in range(settings.CHUNK_SIZE):
-            for lx in range(settings.CHUNK_SIZE):
-                px, py = bx + lx * ts, by + ly * ts
-                if px + ts < 0 or px > settings.SCREEN_W or py + ts < 0 or py > settings.SCREEN_H:
-                    continue
-                if floor[ly][lx] == settings.TILE_DIRT:
-                    drawables.append((py, lambda px=px, py=py: screen.blit(assets.floor_img, (px, py))))
-
-    # Player (draw at screen center, sort by their feet's screen y)
+    surface.fill(settings.BG_COLOR, area)
+
+    # 2) Floors: one cached blit per visible chunk. Floors never overlap a
+    #    wall or the player that sorts before them, so they can all go first.
+    _draw_floors(surface, chunks, ts, cam_x, cam_y, area)
+    profiler.mark('floors')
+
+    # 3) Walls and player, bucketed by screen row. Tiles are grid aligned, so
+    #    visiting rows top to bottom already is painter's order; the player is
+    #    slotted in ahead of the first row whose wall bottom reaches its feet.
     player_screen_x = settings.SCREEN_W // 2
     player_screen_y = settings.SCREEN_H // 2
-    player_feet_screen_y = player_screen_y + assets.TILE_SIZE  # feet in screen coords
-    drawables.append((player_feet_screen_y - 0.1, lambda: screen.blit(assets.player_img, (player_screen_x, player_screen_y))))
-
-    # Walls (drawn so their bottom aligns with tile)
-    for (cx, cy), (floor, wall) in chunks.items():
-        base_x = cx * settings.CHUNK_SIZE
-        base_y = cy * settings.CHUNK_SIZE
-        bx = base_x * ts + cam_x
-        by = base_y * ts + cam_y
-        for ly in range(settings.CHUNK_SIZE):
-            for lx in range(settings.CHUNK_SIZE):
-                if wall[ly][lx] != settings.TILE_DIRT:
-                    continue
-                wx, wy = base_x + lx, base_y + ly
-                px, py = bx + lx * ts, by + ly * ts
-                wall_draw_y = py - (wall_h - ts)
-                # Use the bottom of the wall sprite for sorting
-                sort_y = wall_draw_y + wall_h
-                def draw_wall(px=px, wall_draw_y=wall_draw_y, wx=wx, wy=wy):
-                    screen.blit(assets.wall_img, (px, wall_draw_y))
-                    
-                    # Rim presence
-                    has_north_rim = _get_wall_tile(chunks, wx, wy - 1) != settings.TILE_DIRT
-                    has_south_rim = _get_wall_tile(chunks, wx, wy + 1) != settings.TILE_DIRT
-                    has_west_rim  = _get_wall_tile(chunks, wx - 1, wy) != settings.TILE_DIRT
-                    has_east_rim  = _get_wall_tile(chunks, wx + 1, wy) != settings.TILE_DIRT
-
-                    # North rim
-                    if has_north_rim:
-                        screen.blit(assets.rim_north_img, (px, wall_draw_y))
-
-                    # West rim
-                    if has_west_rim:
-                        screen.blit(assets.rim_west_img, (px, wall_draw_y))
-
-                    # East rim
-                    if has_east_rim:
-                        screen.blit(assets.rim_east_img, (px, wall_draw_y))
-
-                    # South rim
-                    if has_south_rim:
-                        screen.blit(assets.rim_south_img, (px, wall_draw_y))
-
-                    # Corners: always draw if diagonal is wall (regardless of side rims)
-                    nw_corner = _get_wall_tile(chunks, wx - 1, wy - 1) != settings.TILE_DIRT
-                    ne_corner = _get_wall_tile(chunks, wx + 1, wy - 1) != settings.TILE_DIRT
-                    sw_corner = _get_wall_tile(chunks, wx - 1, wy + 1) != settings.TILE_DIRT
-                    se_corner = _get_wall_tile(chunks, wx + 1, wy + 1) != settings.TILE_DIRT
-
-                    if nw_corner:
-                        screen.blit(assets.rim_nw_img, (px, wall_draw_y))
-                    if ne_corner:
-                        screen.blit(assets.rim_ne_img, (px, wall_draw_y))
-                    if sw_corner:
-                        offset = 0 if has_south_rim else -ts // 2
-                        screen.blit(assets.rim_sw_img, (px, wall_draw_y + offset))
-                    if se_corner:
-                        offset = 0 if has_south_rim else -ts // 2
-                        screen.blit(assets.rim_se_img, (px, wall_draw_y + offset))
-                drawables.append((sort_y, draw_wall))
-
-    # Sort by y (painter's algorithm)
-    drawables.sort(key=lambda tup: tup[0])
-
-    # Draw in order
-    for _, draw_fn in drawables:
-        draw_fn()
+    player_feet_screen_y = player_screen_y + ts  # feet in screen coords
+    player_drawn = not with_player
+
+    rows = () if _lod(ts) else _wall_rows(chunks, ts, wall_h, cam_x, cam_y, area)
+    for row_bottom, row in rows:
+        if not player_drawn and row_bottom >= player_feet_screen_y:
+            surface.blit(assets.player_img, (player_screen_x, player_screen_y))
+            player_drawn = True
+        surface.blits(row, False)
+    if not player_drawn:
+        surface.blit(assets.player_img, (player_screen_x, player_screen_y))
+    surface.set_clip(None)
+    profiler.mark('walls')
+
+def _draw_overlay(screen: pygame.Surface, player: dict) -> None:
+    """Draw the debug grid, coordinates, minimap and hotbar over the world."""
+    ts = assets.TILE_SIZE
+    cam_x, cam_y = _camera(player)
 
     # 5) Debug grid overlay
     if settings.DEBUG_MODE:
         _draw_debug_grid(screen, player, ts, cam_x, cam_y)
 
-    # 6) Coordinates
-    coord = _font.render(f"({player['tx']}, {player['ty']})", True, (255, 255, 255))
-    screen.blit(coord, (10, 10))
+    # 6) Coordinates and minimap
+    text.draw_glyphs(screen, _font, f"({player['tx']}, {player['ty']})", (255, 255, 255), (10, 10))
+    minimap.draw(screen, player)
 
     # 7) Hotbar
     draw_hotbar(screen, player)
+    profiler.mark('overlay')
+
+def _wall_rows(
+    chunks: dict,
+    ts: int,
+    wall_h: int,
+    cam_x: int,
+    cam_y: int,
+    area: pygame.Rect
+):
+    """
+    Yield (row_bottom_screen_y, blit_sequence) for each tile row holding
+    walls or torches that reach into `area`, top to bottom. Each wall is one
+    composited sprite chosen by its precomputed rim mask and depth, so no
+    neighbour lookups happen here. Runs of solid-core walls are blitted as a few
+    strips without looking at their masks. The visible layers are read in
+    one pass per frame rather than per row.
+    """
+    rise = wall_h - ts
+    wx0 = (area.left - cam_x) // ts
+    wx1 = (area.right - 1 - cam_x) // ts
+    # A wall sprite reaches (wall_h - ts) + WALL_LIFT above its tile
+    wy0 = (area.top - cam_y) // ts
+    wy1 = (area.bottom - 1 - cam_y + rise + assets.WALL_LIFT) // ts
+    w, h = wx1 - wx0 + 1, wy1 - wy0 + 1
+
+    wall_layer = world.read_region(world.LAYER_WALL, wx0, wy0, w, h)
+    walls = wall_layer == settings.TILE_DIRT
+    depths = world.read_region(world.LAYER_DEPTH, wx0, wy0, w, h)
+    # Walls at the depth cap are solid core only if the cap is 2 or more;
+    # with a lower cap any wall may show a rim, so none takes the core path
+    if settings.MAX_CORE_DEPTH >= 2:
+        core = depths >= settings.MAX_CORE_DEPTH
+    else:
+        core = np.zeros_like(walls)
+    rows = [[] for _ in range(h)]
+    x0 = wx0 * ts + cam_x
+    y0 = wy0 * ts + cam_y - rise - assets.WALL_LIFT
+
+    # Rim walls, one sprite each
+    ys, xs = np.nonzero(walls & ~core)
+    if ys.size:
+        masks = world.read_region(world.LAYER_RIM, wx0, wy0, w, h)[ys, xs].tolist()
+        ys, xs, ds = ys.tolist(), xs.tolist(), depths[ys, xs].tolist()
+        for y, x, mask, depth in zip(ys, xs, masks, ds):
+            rows[y].append((assets.wall_sprite(mask, depth), (x0 + x * ts, y0 + y * ts)))
+
+    # Core walls: each horizontal run split into power-of-two strips
+    if core.any():
+        core_y0 = y0 + assets.WALL_LIFT  # strips have no raised-corner margin
+        edges = np.diff(np.pad(core.view(np.int8), ((0, 0), (1, 1))), axis=1)
+        starts, ends = np.nonzero(edges == 1), np.nonzero(edges == -1)[1]
+        for y, start, end in zip(starts[0].tolist(), starts[1].tolist(), ends.tolist()):
+            row = rows[y]
+            while start < end:
+                n = 1 << ((end - start).bit_length() - 1)
+                row.append((assets.core_strip(n), (x0 + start * ts, core_y0 + y * ts)))
+                start += n
+
+    # Torches, after the walls of their row
+    ys, xs = np.nonzero(wall_layer == settings.TILE_TORCH)
+    torch_y0 = y0 + rise + assets.WALL_LIFT
+    for y, x in zip(ys.tolist(), xs.tolist()):
+        rows[y].append((assets.torch_img, (x0 + x * ts, torch_y0 + y * ts)))
+
+    for y, row in enumerate(rows):
+        if row:
+            yield (wy0 + y) * ts + cam_y + ts, row
+
+# ──────────────────────────────────────────────────────────────
+# Dirty-Rect Frames
+# ──────────────────────────────────────────────────────────────
+
+def draw_frame(screen: pygame.Surface, player: dict, chunks: dict) -> None:
+    """
+    Draw this frame per settings.RENDER_MODE and remember what present()
+    should push. In "dirty" mode, while the camera and zoom are unchanged,
+    only changed tiles, tiles whose lighting changed, the hotbar and last
+    frame's overlays are redrawn.
+    In "scroll" mode the world layer is reused from the last frame.
+    """
+    global _last_view, _last_hotbar, _last_minimap, _update_rects, _scroll_view
+    ts = assets.TILE_SIZE
+    cam_x, cam_y = _camera(player)
+    view = (cam_x, cam_y, ts, settings.SCREEN_W, settings.SCREEN_H, settings.DEBUG_MODE)
+    hotbar = (player['hotbar_version'], player['selected_slot'])
+    changes = world.take_changes()
+    minimap.update(chunks, player)
+    minimap_key = minimap.state_key(player)
+    profiler.mark('minimap')
+    relit = lighting.update(ts, cam_x, cam_y)
+    profiler.mark('lighting')
+    _update_floors(screen, chunks, ts, cam_x, cam_y, changes)
+    profiler.mark('floors')
+
+    rects = None
+    if settings.RENDER_MODE == "scroll":
+        _draw_scrolled(screen, player, chunks, changes)
+    else:
+        _scroll_view = None  # the buffer misses changes drawn meanwhile
+        # Scroll mode darkens the whole screen every frame anyway, so only
+        # here do tiles whose lighting changed need redrawing
+        changes += relit
+        if settings.RENDER_MODE == "dirty" and view == _last_view and None not in changes:
+            panels = []
+            if hotbar != _last_hotbar:
+                panels.append(hotbar_rect())
+            if minimap_key != _last_minimap:
+                panels.append(minimap.rect())
+            rects = _dirty_rects(screen, changes, ts, cam_x, cam_y, panels)
+        if rects is None:
+            _draw_scene(screen, player, chunks, screen.get_rect())
+        else:
+            for rect in rects:
+                _draw_scene(screen, player, chunks, rect)
+    _update_rects = rects
+    _last_view = view
+    _last_hotbar = hotbar
+    _last_minimap = minimap_key
+
+def _dirty_rects(
+    screen: pygame.Surface,
+    changes: list,
+    ts: int,
+    cam_x: int,
+    cam_y: int,
+    panels: List[pygame.Rect]
+) -> Optional[List[pygame.Rect]]:
+    """
+    Screen rects to redraw for a frame with an unchanged view, or None if a
+    full redraw is cheaper. `panels` are overlay panels (hotbar, minimap)
+    whose contents changed.
+    """
+    screen_rect = screen.get_rect()
+    rects = _change_rects(changes, ts, cam_x, cam_y)
+    rects += panels
+    rects += _prev_overlays
+    rects = [r.clip(screen_rect) for r in rects]
+    rects = [r for r in rects if r.width and r.height]
+    # Past half the screen a full redraw is cheaper than overlapping ones
+    if sum(r.width * r.height for r in rects) > screen_rect.width * screen_rect.height // 2:
+        return None
+    return rects
+
+def _change_rects(changes: list, ts: int, cam_x: int, cam_y: int) -> List[pygame.Rect]:
+    """Screen rects that must be redrawn for the changed world tile rects."""
+    # Walls drawn on a changed tile reach up to (wall_h - ts) + WALL_LIFT
+    # above it
+    reach = assets.WALL_HEIGHT - ts + assets.WALL_LIFT
+    return [
+        pygame.Rect(x0 * ts + cam_x, y0 * ts + cam_y - reach, w * ts, h * ts + reach)
+        for x0, y0, w, h in changes
+    ]
+
+def _draw_scrolled(screen: pygame.Surface, player: dict, chunks: dict, changes: list) -> None:
+    """
+    Scroll last frame's world layer by the camera delta and render only the
+    newly exposed strips and changed tiles into it. The player is composited
+    by redrawing the full pipeline clipped to its rect, so walls in front of
+    it overlap exactly as in a full redraw.
+    """
+    global _scroll_buffer, _scroll_view
+    ts = assets.TILE_SIZE
+    cam_x, cam_y = _camera(player)
+    w, h = settings.SCREEN_W, settings.SCREEN_H
+    view = (ts, w, h)
+
+    if _scroll_buffer is None or _scroll_buffer.get_size() != (w, h):
+        _scroll_buffer = pygame.Surface((w, h)).convert()
+        _scroll_view = None
+
+    dx = dy = 0
+    if _scroll_view is not None and _scroll_view[0] == view and None not in changes:
+        dx = cam_x - _scroll_view[1]
+        dy = cam_y - _scroll_view[2]
+    if _scroll_view is None or _scroll_view[0] != view or None in changes or abs(dx) >= w or abs(dy) >= h:
+        _draw_world_layer(_scroll_buffer, player, chunks, _scroll_buffer.get_rect(), False)
+    else:
+        strips = _change_rects(changes, ts, cam_x, cam_y)
+        if dx or dy:
+            _scroll_buffer.scroll(dx, dy)
+            if dx > 0:
+                strips.append(pygame.Rect(0, 0, dx, h))
+            elif dx < 0:
+                strips.append(pygame.Rect(w + dx, 0, -dx, h))
+            if dy > 0:
+                strips.append(pygame.Rect(0, 0, w, dy))
+            elif dy < 0:
+                strips.append(pygame.Rect(0, h + dy, w, -dy))
+        for strip in strips:
+            strip = strip.clip(_scroll_buffer.get_rect())
+            if strip.width and strip.height:
+                _draw_world_layer(_scroll_buffer, player, chunks, strip, False)
+    _scroll_view = (view, cam_x, cam_y)
+
+    screen.blit(_scroll_buffer, (0, 0))
+    player_rect = pygame.Rect(w // 2, h // 2, ts, ts)
+    _draw_world_layer(screen, player, chunks, player_rect, True)
+    lighting.draw(screen, ts, cam_x, cam_y, screen.get_rect())
+    _draw_overlay(screen, player)
+
+def add_overlay(rect: pygame.Rect) -> None:
+    """
+    Register a screen rect drawn over the scene after draw_frame this frame,
+    so it is presented now and restored next frame.
+    """
+    _overlays.append(rect)
 
-def _get_wall_tile(chunks, wx, wy):
-    """Helper to get wall tile type at world (wx, wy)."""
-    cx, lx = divmod(wx, settings.CHUNK_SIZE)
-    cy, ly = divmod(wy, settings.CHUNK_SIZE)
-    key = (cx, cy)
-    if key not in chunks:
-        return settings.TILE_DIRT  # Default to dirt if chunk is missing
-    _, wall = chunks[key]
-    if 0 <= lx < settings.CHUNK_SIZE and 0 <= ly < settings.CHUNK_SIZE:
-        return wall[ly][lx]
-    return settings.TILE_DIRT  # Default to dirt if out of bounds
+def present() -> None:
+    """Push this frame to the display: the whole screen or just the dirty rects."""
+    global _overlays, _prev_overlays
+    if _update_rects is None:
+        pygame.display.flip()
+    else:
+        pygame.display.update(_update_rects + _overlays)
+    _prev_overlays, _overlays = _overlays, []
 
 def _draw_debug_grid(
     screen: pygame.Surface,
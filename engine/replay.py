@@ -0,0 +1,229 @@
+# replay.py
+
+import atexit
+import json
+import shutil
+import tempfile
+import time
+import numpy as np
+import pygame
+from collections import defaultdict
+from engine import settings
+from typing import Any, Dict, List, Optional
+
+# ──────────────────────────────────────────────────────────────
+# Recording Format
+# ──────────────────────────────────────────────────────────────
+#
+# A recording is one JSON object:
+#
+#   version  FORMAT_VERSION
+#   screen   [w, h] the session ran at (replays use the same size)
+#   frames   one entry per game loop iteration:
+#              t       seconds since recording started
+#              dt      frame dt the game loop used; replays feed it back,
+#                      so each frame runs the same number of sim steps
+#              events  events handed to events.handle_events (omitted if none)
+#              keys    pressed key codes, only on frames where they changed
+#
+# Both modes start from a fresh world in a temporary save directory, so a
+# replay sees the same terrain and edits the recording did.
+
+FORMAT_VERSION = 1
+HITCH_COUNT = 10  # worst frames listed in the replay report
+
+# Events the game never reads; left out to keep recordings small
+_SKIPPED_EVENTS = {pygame.MOUSEMOTION}
+
+# Every key code pygame defines, for snapshotting key state
+_ALL_KEYS = sorted({v for name, v in vars(pygame.constants).items() if name.startswith("K_")})
+
+_mode: Optional[str] = None      # None, 'record' or 'replay'
+_path: str = None
+_report_path: Optional[str] = None
+_save_dir: Optional[str] = None
+_recording: Dict[str, Any] = {}
+_frames: List[dict] = []
+_frame: Optional[dict] = None    # record of the current frame
+_frame_index = -1
+_events_taken = False
+_keys: Any = None                # key state for the current frame
+_last_keys: List[int] = []
+_start = 0.0
+_last_tick: Optional[float] = None
+
+frame_times: List[float] = []    # replay: seconds between consecutive ticks
+
+# ──────────────────────────────────────────────────────────────
+# Session Setup
+# ──────────────────────────────────────────────────────────────
+
+def _use_temp_world() -> None:
+    global _save_dir
+    _save_dir = tempfile.mkdtemp(prefix="endless-replay-")
+    settings.SAVE_DIR = _save_dir
+
+def start_recording(path: str) -> None:
+    """Record every frame's input to `path`, written when the game exits."""
+    global _mode, _path, _start
+    _mode, _path = 'record', path
+    _use_temp_world()
+    _start = time.perf_counter()
+    atexit.register(finish)
+
+def start_replay(path: str, report_path: Optional[str] = None) -> tuple:
+    """
+    Load a recording to feed back instead of live input. Returns the screen
+    size it was recorded at. The frame-time report is printed on exit and
+    also written as JSON to `report_path` if given.
+    """
+    global _mode, _path, _report_path, _recording, _frames
+    with open(path) as f:
+        _recording = json.load(f)
+    if _recording.get('version') != FORMAT_VERSION:
+        raise RuntimeError(f"Recording '{path}' has an unsupported format version")
+    _mode, _path, _report_path = 'replay', path, report_path
+    _frames = _recording['frames']
+    _use_temp_world()
+    atexit.register(finish)
+    return tuple(_recording['screen'])
+
+# ──────────────────────────────────────────────────────────────
+# Per-Frame Input
+# ──────────────────────────────────────────────────────────────
+
+def tick(clock: pygame.time.Clock) -> float:
+    """
+    Start a frame and return its dt in seconds. Live and recording runs are
+    capped at settings.FPS; replays run unthrottled but return each frame's
+    recorded dt, so the simulation advances exactly as it did.
+    """
+    global _frame, _frame_index, _events_taken, _keys, _last_tick
+    _events_taken = False
+    _keys = None
+
+    if _mode == 'replay':
+        now = time.perf_counter()
+        if _last_tick is not None:
+            frame_times.append(now - _last_tick)
+        _last_tick = now
+        _frame_index += 1
+        _frame = _frames[_frame_index] if _frame_index < len(_frames) else None
+        if _frame is None:
+            return 1.0 / settings.FPS  # the final QUIT frame
+        return _frame['dt']
+
+    dt = clock.tick(settings.FPS) / 1000.0
+    if _mode == 'record':
+        _frame = {'t': round(time.perf_counter() - _start, 6), 'dt': dt}
+        _frames.append(_frame)
+    return dt
+
+def _encode_event(ev: pygame.event.Event) -> dict:
+    """Event type plus its JSON-representable attributes."""
+    data = {'type': ev.type}
+    for key, value in ev.dict.items():
+        if isinstance(value, (bool, int, float, str)):
+            data[key] = value
+        elif isinstance(value, tuple) and all(isinstance(v, (int, float)) for v in value):
+            data[key] = list(value)
+    return data
+
+def _decode_event(data: dict) -> pygame.event.Event:
+    attrs = {k: tuple(v) if isinstance(v, list) else v for k, v in data.items() if k != 'type'}
+    return pygame.event.Event(data['type'], attrs)
+
+def get_events() -> List[pygame.event.Event]:
+    """
+    This frame's events, in place of pygame.event.get(). A replay hands out
+    the recorded events once per frame and a QUIT after the last frame.
+    """
+    global _events_taken
+    if _mode != 'replay':
+        events = pygame.event.get()
+        if _mode == 'record':
+            recorded = [_encode_event(ev) for ev in events if ev.type not in _SKIPPED_EVENTS]
+            if recorded:
+                _frame.setdefault('events', []).extend(recorded)
+        return events
+
+    if _events_taken:
+        return []
+    _events_taken = True
+    if _frame is None:
+        return [pygame.event.Event(pygame.QUIT)]
+    return [_decode_event(data) for data in _frame.get('events', ())]
+
+def get_pressed() -> Any:
+    """
+    This frame's key state, in place of pygame.key.get_pressed(); index it
+    with pygame key constants. Sampled once per frame.
+    """
+    global _keys, _last_keys
+    if _keys is not None:
+        return _keys
+
+    if _mode == 'replay':
+        if _frame is not None and 'keys' in _frame:
+            _last_keys = _frame['keys']
+        _keys = defaultdict(bool, {k: True for k in _last_keys})
+        return _keys
+
+    _keys = pygame.key.get_pressed()
+    if _mode == 'record':
+        pressed = [k for k in _ALL_KEYS if _keys[k]]
+        if pressed != _last_keys:
+            _frame['keys'] = pressed
+            _last_keys = pressed
+    return _keys
+
+# ──────────────────────────────────────────────────────────────
+# Session End & Report
+# ──────────────────────────────────────────────────────────────
+
+def frame_report() -> Dict[str, Any]:
+    """Frame-time percentiles (ms) and the worst hitches of a replay."""
+    times = np.array(frame_times) * 1000.0
+    if len(times) == 0:
+        return {'frames': 0}
+    worst = np.argsort(times)[::-1][:HITCH_COUNT]
+    return {
+        'frames': len(times),
+        'mean_ms': float(times.mean()),
+        'p50_ms': float(np.percentile(times, 50)),
+        'p95_ms': float(np.percentile(times, 95)),
+        'p99_ms': float(np.percentile(times, 99)),
+        'max_ms': float(times.max()),
+        # frame_times[i] is the time spent on recorded frame i
+        'hitches': [
+            {'frame': int(i), 't': _frames[i]['t'], 'ms': float(times[i])}
+            for i in worst
+        ],
+    }
+
+def finish() -> None:
+    """Write the recording or print the replay report. Runs at exit."""
+    global _mode
+    if _mode == 'record':
+        _recording.update({
+            'version': FORMAT_VERSION,
+            'screen': [settings.SCREEN_W, settings.SCREEN_H],
+            'frames': _frames,
+        })
+        with open(_path, "w") as f:
+            json.dump(_recording, f, separators=(",", ":"))
+        print(f"Recorded {len(_frames)} frames to {_path}")
+    elif _mode == 'replay':
+        report = frame_report()
+        print(f"Replayed {_path}: {report['frames']} frames")
+        if report['frames']:
+            print("  mean {mean_ms:.2f} ms  p50 {p50_ms:.2f}  p95 {p95_ms:.2f}  "
+                  "p99 {p99_ms:.2f}  max {max_ms:.2f}".format(**report))
+            for hitch in report['hitches']:
+                print(f"  frame {hitch['frame']:>6} (t={hitch['t']:.2f}s)  {hitch['ms']:.2f} ms")
+        if _report_path:
+            with open(_report_path, "w") as f:
+                json.dump(report, f, indent=2)
+    _mode = None
+    if _save_dir:
+        shutil.rmtree(_save_dir, ignore_errors=True)
@@ -8,13 +8,30 @@ DEBUG_MODE        = True
 DEBUG_GRID_COLOR  = (255, 0, 0)
 DEBUG_GRID_RADIUS = 10
 
+PROFILER_FRAMES       = 600   # Frames kept in the profiler ring buffer
+PROFILER_AVG_FRAMES   = 60    # Frames averaged for the HUD readout
+PROFILER_GRAPH_FRAMES = 240   # Frames shown in the HUD graph (1 px each)
+PROFILER_HUD_REFRESH  = 15    # Frames between HUD text updates
+
 # ──────────────────────────────────────────────────────────────
 # Screen & Frame Settings
 # ──────────────────────────────────────────────────────────────
 
-FPS       = 60
+FPS       = 60  # Render frame cap
 SCREEN_W  = 0   # Set in main()
 SCREEN_H  = 0
+BG_COLOR  = (20, 20, 30)  # Behind floors, and where there is no floor
+
+SIM_HZ         = 60   # Fixed simulation steps per second
+MAX_SIM_STEPS  = 5    # Catch-up steps per frame before the simulation slows
+
+# "full" redraws every frame; "dirty" redraws and presents only changed
+# regions while the camera and zoom stay put; "scroll" reuses last frame's
+# world layer, rendering only strips exposed by camera motion
+RENDER_MODE          = "dirty"
+MAX_CHANGED_REGIONS  = 64    # Tracked tile edits per frame before a full redraw
+
+TEXT_CACHE_SIZE      = 64    # Rendered HUD strings kept (LRU)
 
 # ──────────────────────────────────────────────────────────────
 # Chunk & Tile Settings
@@ -23,8 +40,35 @@ SCREEN_H  = 0
 CHUNK_SIZE   = 16    # Tiles per chunk (width/height)
 LOAD_RADIUS  = 2     # Chunks to load around player
 
+GEN_WORKERS        = 2    # Background chunk generation threads
+GEN_MAX_IN_FLIGHT  = 16   # Max chunks queued/generating at once
+
+SAVE_DIR = "saves"        # Region files holding chunk edit overlays
+AUTOSAVE_SECONDS = 30.0   # Write unsaved edits this often (also on chunk unload and quit)
+
 TILE_EMPTY   = 0
 TILE_DIRT    = 1
+TILE_TORCH   = 2     # Wall layer only: a torch standing on the floor
+
+# ──────────────────────────────────────────────────────────────
+# Terrain Generation (Perlin noise; walls where noise <= 0)
+# ──────────────────────────────────────────────────────────────
+
+TERRAIN_SCALE   = 0.1   # Noise units per tile
+TERRAIN_OCTAVES = 2
+
+# ──────────────────────────────────────────────────────────────
+# Wall Rim Autotile Bits (set when that neighbour is not a wall)
+# ──────────────────────────────────────────────────────────────
+
+RIM_N   = 1 << 0
+RIM_S   = 1 << 1
+RIM_W   = 1 << 2
+RIM_E   = 1 << 3
+RIM_NW  = 1 << 4
+RIM_NE  = 1 << 5
+RIM_SW  = 1 << 6
+RIM_SE  = 1 << 7
 
 # ──────────────────────────────────────────────────────────────
 # Zoom & Tile Size Settings
@@ -33,12 +77,32 @@ TILE_DIRT    = 1
 MIN_TILES_ACROSS     = 16   # Most zoomed-in (largest tiles)
 MAX_TILES_ACROSS     = 50   # Most zoomed-out (smallest tiles)
 DEFAULT_TILES_ACROSS = 28   # Default zoom level
+ZOOM_STEP_PX         = 4    # Tile size change per mouse-wheel tick
+
+ZOOM_CACHE_MAX_MB    = 128  # Memory budget for cached per-zoom sprite sets
+FLOOR_CACHE_MAX_MB   = 64   # Memory budget for baked per-chunk floor surfaces
+FLOOR_BAKE_PX        = 1 << 18  # Floor pixels baked per frame; unbaked floors are drawn per tile
+
+# Zoomed out past LOD_TILES_ACROSS, chunks are drawn from flat one pixel
+# per tile thumbnails scaled up instead of from sprites
+LOD_TILES_ACROSS     = 40
+
+# ──────────────────────────────────────────────────────────────
+# Minimap
+# ──────────────────────────────────────────────────────────────
+
+MINIMAP_VISIBLE     = True            # Toggle with M
+MINIMAP_CHUNKS      = 15              # Chunks across the minimap (1 px per tile)
+MINIMAP_FOG_COLOR   = (45, 45, 55)    # Chunks not explored yet
+MINIMAP_TORCH_COLOR = (255, 140, 30)  # Torches, on the minimap and at LOD zoom
+THUMB_CACHE_SIZE    = 4096            # Chunk thumbnails remembered for the minimap (LRU)
 
 # ──────────────────────────────────────────────────────────────
 # Movement & Player Settings
 # ──────────────────────────────────────────────────────────────
 
 SPEED_TILES_PER_SEC = 8
+PATH_NODES_PER_FRAME = 500   # A* nodes expanded per frame for click-to-move
 
 # ──────────────────────────────────────────────────────────────
 # Asset Filenames & Directory
@@ -48,6 +112,7 @@ ASSETS_DIR          = "assets"
 FLOOR_TILE_FILE     = "dirt_floor.png"
 WALL_TILE_FILE      = "dirt_wall.png"
 PLAYER_SPRITE_FILE  = "sprite_player.png"
+ASSET_CACHE_FILE    = "assets.cache"  # Decoded sprite atlas, rebuilt when asset files change
 
 # ──────────────────────────────────────────────────────────────
 # Hotbar Settings
@@ -56,6 +121,7 @@ PLAYER_SPRITE_FILE  = "sprite_player.png"
 HOTBAR_SLOTS      = 10
 HOTBAR_SLOT_SIZE  = 40
 HOTBAR_PADDING    = 4
+START_TORCHES     = 10    # Torches in the second slot of a new player
 
 # ──────────────────────────────────────────────────────────────
 # Spawn Protection (tiles)
@@ -68,11 +134,17 @@ SPAWN_PROTECT_HEIGHT  = 5
 # Lighting & Shading Settings
 # ──────────────────────────────────────────────────────────────
 
-LIGHT_RADIUS_TILES = 6
-MAX_DARKNESS       = 245
+LIGHTING_ENABLED   = True  # Darkness overlay (toggle with L)
+LIGHT_RADIUS_TILES = 6     # Player light reach; light this strong is full brightness
+TORCH_LIGHT_TILES  = 8     # Torch light reach
+MAX_DARKNESS       = 245   # Unlit tiles are multiplied by (255 - this) / 255
 
 # ──────────────────────────────────────────────────────────────
 # Core Shading Depth (tiles)
 # ──────────────────────────────────────────────────────────────
 
-MAX_CORE_DEPTH = 2
+# Walls darken by DEPTH_SHADE_STEP per tile of depth. Walls at depth
+# MAX_CORE_DEPTH, if that is 2 or more (deep enough that no rim can show),
+# take a "solid core" path that skips rim lookups
+MAX_CORE_DEPTH   = 2
+DEPTH_SHADE_STEP = 0.25
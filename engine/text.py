@@ -0,0 +1,90 @@
+# text.py
+
+import pygame
+from collections import OrderedDict
+from engine import settings
+from typing import Dict, Tuple
+
+Color = Tuple[int, int, int]
+
+# ──────────────────────────────────────────────────────────────
+# Text Surface Cache
+# ──────────────────────────────────────────────────────────────
+
+# Rendered strings keyed by (font, text, colour), least recently used first
+_cache: "OrderedDict[Tuple[pygame.font.Font, str, Color], pygame.Surface]" = OrderedDict()
+
+cache_hits = 0
+cache_misses = 0
+
+def render(font: pygame.font.Font, text: str, color: Color) -> pygame.Surface:
+    """
+    Return `text` rendered antialiased in `color`, rasterizing it only on
+    first use. Treat the returned surface as read-only.
+    """
+    global cache_hits, cache_misses
+    key = (font, text, color)
+    surf = _cache.get(key)
+    if surf is not None:
+        _cache.move_to_end(key)
+        cache_hits += 1
+        return surf
+    cache_misses += 1
+    surf = font.render(text, True, color)
+    _cache[key] = surf
+    if len(_cache) > settings.TEXT_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return surf
+
+# ──────────────────────────────────────────────────────────────
+# Glyph Atlas
+# ──────────────────────────────────────────────────────────────
+#
+# Strings that change often, such as coordinates and stack counts, would
+# fill the text cache with one-off entries. They are drawn instead from
+# per-character glyph surfaces, rendered once per (font, colour). Glyphs
+# are placed by their rendered widths, which matches a whole-string render
+# except where the font kerns a pair.
+
+GLYPH_CHARS = "0123456789-+(),. "
+
+_glyphs: Dict[Tuple[pygame.font.Font, Color], Dict[str, pygame.Surface]] = {}
+
+def _glyph_atlas(font: pygame.font.Font, color: Color) -> Dict[str, pygame.Surface]:
+    atlas = _glyphs.get((font, color))
+    if atlas is None:
+        atlas = {ch: font.render(ch, True, color) for ch in GLYPH_CHARS}
+        _glyphs[(font, color)] = atlas
+    return atlas
+
+def _glyph(atlas: Dict[str, pygame.Surface], font: pygame.font.Font, color: Color, ch: str) -> pygame.Surface:
+    surf = atlas.get(ch)
+    if surf is None:
+        surf = atlas[ch] = font.render(ch, True, color)
+    return surf
+
+def glyphs_size(font: pygame.font.Font, text: str, color: Color) -> Tuple[int, int]:
+    """Size of `text` as drawn by draw_glyphs."""
+    atlas = _glyph_atlas(font, color)
+    return sum(_glyph(atlas, font, color, ch).get_width() for ch in text), font.get_height()
+
+def draw_glyphs(
+    surface: pygame.Surface,
+    font: pygame.font.Font,
+    text: str,
+    color: Color,
+    pos: Tuple[int, int]
+) -> pygame.Rect:
+    """
+    Draw `text` at `pos` from cached glyph surfaces and return the area
+    covered.
+    """
+    atlas = _glyph_atlas(font, color)
+    x, y = pos
+    seq = []
+    for ch in text:
+        glyph = _glyph(atlas, font, color, ch)
+        seq.append((glyph, (x, y)))
+        x += glyph.get_width()
+    surface.blits(seq, False)
+    return pygame.Rect(pos[0], y, x - pos[0], font.get_height())
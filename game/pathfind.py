@@ -0,0 +1,121 @@
+# pathfind.py
+
+import heapq
+from itertools import count
+from game import world
+from typing import Any, Dict, List, Optional, Tuple
+
+# ──────────────────────────────────────────────────────────────
+# Incremental A* Search
+# ──────────────────────────────────────────────────────────────
+#
+# Click-to-move paths are found with A* over 4-connected tiles, using the
+# walkability bitmap of the loaded chunks copied when the search starts.
+# One search runs at a time and advance() expands a bounded number of nodes
+# per call, so a long search is spread over several frames. Nodes are flat
+# indices y * width + x into that copy. Edits made while a search runs are
+# not seen by it; the player checks each step of the path as it walks.
+
+_search: Optional[Dict[str, Any]] = None
+
+def find_path(start: Tuple[int, int], goal: Tuple[int, int]) -> None:
+    """
+    Start searching for a path from tile `start` to tile `goal`, replacing
+    any search in progress. Poll advance() for the result.
+    """
+    global _search
+    bounds = world.loaded_bounds()
+    if bounds is None:
+        _search = {'result': []}
+        return
+    x0, y0, w, h = bounds
+    sx, sy = start[0] - x0, start[1] - y0
+    gx, gy = goal[0] - x0, goal[1] - y0
+    grid = world.can_walk_region(x0, y0, w, h).tobytes()
+    if not (0 <= gx < w and 0 <= gy < h and grid[gy * w + gx]
+            and 0 <= sx < w and 0 <= sy < h):
+        _search = {'result': []}
+        return
+
+    s = sy * w + sx
+    _search = {
+        'origin': (x0, y0), 'width': w, 'height': h, 'grid': grid,
+        'goal': gy * w + gx, 'goal_xy': (gx, gy),
+        'open': [(abs(gx - sx) + abs(gy - sy), 0, 0, s)],  # (f, tiebreak, g, node)
+        'g': {s: 0},
+        'came_from': {s: None},
+        'tiebreak': count(1),
+        'result': None,
+    }
+
+def cancel() -> None:
+    """Drop the search in progress, if any."""
+    global _search
+    _search = None
+
+def searching() -> bool:
+    """True while a search has not produced its result yet."""
+    return _search is not None and _search['result'] is None
+
+def advance(budget: int) -> Optional[List[Tuple[int, int]]]:
+    """
+    Expand up to `budget` nodes of the current search. Once it ends, returns
+    the path as world tiles after the start up to and including the goal
+    ([] if the goal cannot be reached) and clears the search; returns None
+    while still searching or when there is no search.
+    """
+    global _search
+    search = _search
+    if search is None:
+        return None
+    if search['result'] is None:
+        _expand(search, budget)
+        if search['result'] is None:
+            return None
+    _search = None
+    return search['result']
+
+def _expand(search: Dict[str, Any], budget: int) -> None:
+    w, h, grid = search['width'], search['height'], search['grid']
+    goal = search['goal']
+    gx, gy = search['goal_xy']
+    open_heap, g_cost, came_from = search['open'], search['g'], search['came_from']
+    tiebreak = search['tiebreak']
+
+    while open_heap and budget > 0:
+        _, _, g, node = heapq.heappop(open_heap)
+        if g > g_cost[node]:
+            continue  # stale entry, reached more cheaply since
+        if node == goal:
+            search['result'] = _trace(search, node)
+            return
+        budget -= 1
+        y, x = divmod(node, w)
+        for nb, nx, ny in (
+            (node - 1, x - 1, y), (node + 1, x + 1, y),
+            (node - w, x, y - 1), (node + w, x, y + 1),
+        ):
+            if not (0 <= nx < w and 0 <= ny < h and grid[nb]):
+                continue
+            ng = g + 1
+            if ng < g_cost.get(nb, ng + 1):
+                g_cost[nb] = ng
+                came_from[nb] = node
+                # Later entries win ties, which favours the deepest node
+                # and keeps the search heading for the goal
+                f = ng + abs(gx - nx) + abs(gy - ny)
+                heapq.heappush(open_heap, (f, -next(tiebreak), ng, nb))
+    if not open_heap:
+        search['result'] = []
+
+def _trace(search: Dict[str, Any], node: int) -> List[Tuple[int, int]]:
+    w = search['width']
+    x0, y0 = search['origin']
+    came_from = search['came_from']
+    path = []
+    while came_from[node] is not None:
+        y, x = divmod(node, w)
+        path.append((x0 + x, y0 + y))
+        node = came_from[node]
+    path.reverse()
+    return path
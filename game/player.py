@@ -1,8 +1,7 @@
-import sys
 import pygame
 from engine import settings
 from engine import assets
-from game import world
+from game import world, pathfind
 from typing import Dict, Any
 
 # ──────────────────────────────────────────────────────────────
@@ -11,42 +10,59 @@ from typing import Dict, Any
 
 def init_player(start_tile_size: int) -> Dict[str, Any]:
     """
-    Initialize and return the player state dictionary.
+    Initialize and return the player state dictionary, with START_TORCHES
+    torches in the second hotbar slot. Requires assets.update_zoom().
     """
     ts = start_tile_size
     state = {
         'tx': 0, 'ty': 0,             # tile coordinates
         'px': 0, 'py': 0,             # pixel coordinates
+        'prev_px': 0, 'prev_py': 0,   # pixel coordinates before the last sim step
         'target_x': 0, 'target_y': 0, # move target in pixels
         'moving': False,
+        'path': [],                   # click-to-move tiles still to walk
         'hotbar': [None] * settings.HOTBAR_SLOTS,
+        'hotbar_version': 0,          # bumped whenever hotbar contents change
         'selected_slot': 0,
     }
+    if settings.START_TORCHES > 0:
+        state['hotbar'][1] = {'type': 'torch', 'count': settings.START_TORCHES, 'image': assets.torch_img}
     state['px'] = state['tx'] * ts
     state['py'] = state['ty'] * ts
-    state['target_x'] = state['px']
-    state['target_y'] = state['py']
+    state['prev_px'] = state['target_x'] = state['px']
+    state['prev_py'] = state['target_y'] = state['py']
     return state
 
+def view_state(state: Dict[str, Any], alpha: float) -> Dict[str, Any]:
+    """
+    Return a copy of the player state for drawing, with the pixel position
+    interpolated `alpha` (0..1) of the way from the previous sim step.
+    """
+    view = dict(state)
+    view['px'] = state['prev_px'] + (state['px'] - state['prev_px']) * alpha
+    view['py'] = state['prev_py'] + (state['py'] - state['prev_py']) * alpha
+    return view
+
 # ──────────────────────────────────────────────────────────────
 # Input & Movement
 # ──────────────────────────────────────────────────────────────
 
-def update_input(state: Dict[str, Any], tile_size: int, dt: float) -> None:
+def update_input(
+    state: Dict[str, Any],
+    snapshot: Dict[str, Any],
+    tile_size: int,
+    dt: float
+) -> None:
     """
-    Handle player input and movement.
+    Handle player input and movement for one simulation step of `dt` seconds,
+    reading held keys from the frame's input snapshot (see controls.poll).
     """
-    # Handle quit events
-    for ev in pygame.event.get():
-        if ev.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
-        pygame.event.post(ev)
+    state['prev_px'], state['prev_py'] = state['px'], state['py']
+    keys = snapshot['keys']
 
-    # WASD movement (one direction per frame)
+    # WASD movement (one direction per frame); it overrides click-to-move
     if not state['moving']:
         ntx, nty = state['tx'], state['ty']
-        keys = pygame.key.get_pressed()
         if keys[pygame.K_a]:
             ntx -= 1
         elif keys[pygame.K_d]:
@@ -56,6 +72,11 @@ def update_input(state: Dict[str, Any], tile_size: int, dt: float) -> None:
         elif keys[pygame.K_s]:
             nty += 1
 
+        if (ntx, nty) != (state['tx'], state['ty']):
+            stop_path(state)
+        elif state['path']:
+            ntx, nty = _next_path_step(state)
+
         if (ntx, nty) != (state['tx'], state['ty']) and world.can_walk(ntx, nty):
             state['tx'], state['ty'] = ntx, nty
             state['target_x'] = ntx * tile_size
@@ -76,31 +97,85 @@ def update_input(state: Dict[str, Any], tile_size: int, dt: float) -> None:
             state['py'] += dy / dist * step
 
     # Hotbar number keys 1–9,0
-    keys = pygame.key.get_pressed()
     for i in range(settings.HOTBAR_SLOTS):
         key = pygame.K_1 + i if i < 9 else pygame.K_0
         if keys[key]:
             state['selected_slot'] = i
 
+# ──────────────────────────────────────────────────────────────
+# Click-to-Move
+# ──────────────────────────────────────────────────────────────
+
+def move_to(state: Dict[str, Any], goal: tuple) -> None:
+    """
+    Walk to tile `goal` once a path is found. Searching runs a few nodes
+    per frame (see pathfind.advance); the result lands in state['path'].
+    """
+    state['path'] = []
+    pathfind.find_path((state['tx'], state['ty']), goal)
+
+def stop_path(state: Dict[str, Any]) -> None:
+    """Abandon click-to-move."""
+    state['path'] = []
+    pathfind.cancel()
+
+def _next_path_step(state: Dict[str, Any]) -> tuple:
+    """
+    Pop the next tile of the path. If an edit has blocked it, search again
+    from here and stay put meanwhile.
+    """
+    path = state['path']
+    ntx, nty = path[0]
+    if world.can_walk(ntx, nty) and abs(ntx - state['tx']) + abs(nty - state['ty']) == 1:
+        path.pop(0)
+        return ntx, nty
+    move_to(state, path[-1])
+    return state['tx'], state['ty']
+
 # ──────────────────────────────────────────────────────────────
 # Hotbar & Inventory
 # ──────────────────────────────────────────────────────────────
 
 def add_to_hotbar(state: Dict[str, Any], item_type: str, image: Any) -> None:
     """
-    Add one block of item_type to the selected hotbar slot, stacking if possible.
+    Add one block of item_type to the hotbar: onto the selected slot if it
+    is empty or holds the same type, else onto another stack of that type,
+    else into the first empty slot. Dropped if the hotbar is full.
     """
+    hotbar = state['hotbar']
     slot_idx = state['selected_slot']
-    cur = state['hotbar'][slot_idx]
-    if isinstance(cur, dict) and cur.get('type') == item_type:
+    cur = hotbar[slot_idx]
+    if cur is not None and cur.get('type') != item_type:
+        same = [i for i, itm in enumerate(hotbar) if itm is not None and itm.get('type') == item_type]
+        empty = [i for i, itm in enumerate(hotbar) if itm is None]
+        if not (same or empty):
+            return
+        slot_idx = (same or empty)[0]
+        cur = hotbar[slot_idx]
+    state['hotbar_version'] += 1
+    if cur is not None:
         cur['count'] += 1
     else:
-        state['hotbar'][slot_idx] = {
+        hotbar[slot_idx] = {
             'type':  item_type,
             'count': 1,
             'image': image
         }
 
+def selected_type(state: Dict[str, Any]) -> Any:
+    """Item type in the selected hotbar slot, or None if it is empty."""
+    slot = state['hotbar'][state['selected_slot']]
+    return slot.get('type') if isinstance(slot, dict) else None
+
+def _use_selected(state: Dict[str, Any]) -> None:
+    """Consume one item from the selected hotbar slot."""
+    slot_idx = state['selected_slot']
+    slot = state['hotbar'][slot_idx]
+    slot['count'] -= 1
+    state['hotbar_version'] += 1
+    if slot['count'] <= 0:
+        state['hotbar'][slot_idx] = None
+
 # ──────────────────────────────────────────────────────────────
 # Block Placement
 # ──────────────────────────────────────────────────────────────
@@ -108,9 +183,7 @@ def add_to_hotbar(state: Dict[str, Any], item_type: str, image: Any) -> None:
 def place_dirt(
     state: Dict[str, Any],
     gx: int,
-    gy: int,
-    floor: list,
-    wall: list
+    gy: int
 ) -> bool:
     """
     On right-click:
@@ -126,23 +199,39 @@ def place_dirt(
     if not (isinstance(slot, dict) and slot.get('type') == 'dirt' and slot.get('count', 0) > 0):
         return False
 
-    lx, ly = gx % settings.CHUNK_SIZE, gy % settings.CHUNK_SIZE
+    floor = world.get_tile(gx, gy, world.LAYER_FLOOR)
+    wall = world.get_tile(gx, gy, world.LAYER_WALL)
 
     # 1) Place floor
-    if floor[ly][lx] == settings.TILE_EMPTY:
-        floor[ly][lx] = settings.TILE_DIRT
-        slot['count'] -= 1
-        if slot['count'] <= 0:
-            state['hotbar'][slot_idx] = None
+    if floor == settings.TILE_EMPTY:
+        world.set_tile(gx, gy, world.LAYER_FLOOR, settings.TILE_DIRT)
+        _use_selected(state)
         return True
 
     # 2) Else place wall (only if floor exists)
-    elif floor[ly][lx] == settings.TILE_DIRT and wall[ly][lx] == settings.TILE_EMPTY:
-        wall[ly][lx] = settings.TILE_DIRT
-        slot['count'] -= 1
-        if slot['count'] <= 0:
-            state['hotbar'][slot_idx] = None
+    elif floor == settings.TILE_DIRT and wall == settings.TILE_EMPTY:
+        world.set_tile(gx, gy, world.LAYER_WALL, settings.TILE_DIRT)
+        _use_selected(state)
         return True
 
     # No block placed
     return False
+
+def place_torch(
+    state: Dict[str, Any],
+    gx: int,
+    gy: int
+) -> bool:
+    """
+    On right-click with torches selected: stand a torch on an empty floor
+    tile (not the player's own). Torches live in the wall layer, so they
+    block walking but not light. Returns True if one was placed.
+    """
+    slot = state['hotbar'][state['selected_slot']]
+    if not (isinstance(slot, dict) and slot.get('type') == 'torch' and slot.get('count', 0) > 0):
+        return False
+    if (gx, gy) == (state['tx'], state['ty']) or not world.can_walk(gx, gy):
+        return False
+    world.set_tile(gx, gy, world.LAYER_WALL, settings.TILE_TORCH)
+    _use_selected(state)
+    return True
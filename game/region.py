@@ -0,0 +1,102 @@
+# region.py
+
+import os
+import struct
+import numpy as np
+from engine import settings
+from typing import Dict, Tuple
+
+# Edited tiles of one chunk: {ly * CHUNK_SIZE + lx: (floor, wall)}
+Overlay = Dict[int, Tuple[int, int]]
+
+# ──────────────────────────────────────────────────────────────
+# Region File Format
+# ──────────────────────────────────────────────────────────────
+#
+# Terrain is regenerated identically on every load from fixed Perlin noise
+# settings (TERRAIN_SCALE, TERRAIN_OCTAVES), so only player edits are
+# saved: one edit overlay per touched chunk, grouped into region files of
+# REGION_SIZE x REGION_SIZE chunks named r.<rx>.<ry>.bin inside
+# settings.SAVE_DIR. A file is read and written whole:
+#
+#   header   magic, format version, chunk size, region size, chunk count
+#   chunks   per chunk: its (lx, ly) position within the region and its
+#            edit count, followed by that many (tile index, floor, wall)
+#            edit records
+#
+# File size grows with the number of edited tiles, not with the area
+# explored. Files are replaced atomically, so a crash mid-save leaves the
+# previous version intact.
+
+MAGIC = b"ENDR"
+FORMAT_VERSION = 2
+REGION_SIZE = 32
+
+_HEADER = struct.Struct("<4sHHHI")
+_CHUNK = struct.Struct("<BBH")
+_EDIT = np.dtype([('index', '<u2'), ('floor', 'u1'), ('wall', 'u1')])
+
+def region_of(cx: int, cy: int) -> Tuple[int, int]:
+    """Return the (rx, ry) region holding chunk (cx, cy)."""
+    return cx // REGION_SIZE, cy // REGION_SIZE
+
+def _region_path(rx: int, ry: int) -> str:
+    return os.path.join(settings.SAVE_DIR, f"r.{rx}.{ry}.bin")
+
+# ──────────────────────────────────────────────────────────────
+# Overlay Read/Write
+# ──────────────────────────────────────────────────────────────
+
+def read_overlays(rx: int, ry: int) -> Dict[Tuple[int, int], Overlay]:
+    """
+    Return the saved overlays of region (rx, ry) as {(cx, cy): overlay},
+    empty if the region was never saved.
+    """
+    path = _region_path(rx, ry)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if len(data) < _HEADER.size:
+        raise RuntimeError(f"Region file '{path}' has an incompatible format")
+    magic, version, chunk_size, region_size, count = _HEADER.unpack_from(data)
+    if (magic, version, chunk_size, region_size) != (MAGIC, FORMAT_VERSION, settings.CHUNK_SIZE, REGION_SIZE):
+        raise RuntimeError(f"Region file '{path}' has an incompatible format")
+
+    overlays = {}
+    pos = _HEADER.size
+    for _ in range(count):
+        lx, ly, n = _CHUNK.unpack_from(data, pos)
+        pos += _CHUNK.size
+        edits = np.frombuffer(data, dtype=_EDIT, count=n, offset=pos)
+        pos += n * _EDIT.itemsize
+        overlays[(rx * REGION_SIZE + lx, ry * REGION_SIZE + ly)] = dict(zip(
+            edits['index'].tolist(), zip(edits['floor'].tolist(), edits['wall'].tolist())))
+    return overlays
+
+def write_overlays(rx: int, ry: int, overlays: Dict[Tuple[int, int], Overlay]) -> None:
+    """
+    Replace the saved overlays of region (rx, ry) with `overlays`, every
+    one of which must lie in that region. An empty dict deletes the file.
+    """
+    path = _region_path(rx, ry)
+    overlays = {coord: edits for coord, edits in overlays.items() if edits}
+    if not overlays:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+
+    parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, settings.CHUNK_SIZE, REGION_SIZE, len(overlays))]
+    for (cx, cy), edits in sorted(overlays.items()):
+        records = np.empty(len(edits), dtype=_EDIT)
+        records['index'] = list(edits)
+        records['floor'], records['wall'] = zip(*edits.values())
+        parts.append(_CHUNK.pack(cx - rx * REGION_SIZE, cy - ry * REGION_SIZE, len(edits)))
+        parts.append(records.tobytes())
+
+    os.makedirs(settings.SAVE_DIR, exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(b"".join(parts))
+    os.replace(tmp, path)
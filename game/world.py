@@ -1,38 +1,120 @@
 # world.py
 
-from engine import settings
-from noise import pnoise2
-from collections import deque
-from typing import Dict, Tuple, List
+import time
+import numpy as np
+from engine import settings, profiler
+from game import terrain, region
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import count
+from typing import Dict, Tuple, Optional, Iterable
 
 # ──────────────────────────────────────────────────────────────
 # Chunk Storage
 # ──────────────────────────────────────────────────────────────
 
-# Chunks are stored as {(cx, cy): (floor, wall)}
-chunks: Dict[Tuple[int, int], Tuple[List[List[int]], List[List[int]]]] = {}
+# Each chunk is one contiguous uint8 array of shape (CHUNK_LAYERS, size, size),
+# indexed [layer, ly, lx]. LAYER_RIM holds the autotile mask of each wall tile
+# (settings.RIM_* bits, set for open neighbours); LAYER_DEPTH holds each wall
+# tile's depth, capped at settings.MAX_CORE_DEPTH; LAYER_WALK is 1 where the
+# tile can be walked on.
+LAYER_FLOOR  = 0
+LAYER_WALL   = 1
+LAYER_RIM    = 2
+LAYER_DEPTH  = 3
+LAYER_WALK   = 4
+CHUNK_LAYERS = 5
+
+# Chunks are stored as {(cx, cy): ndarray}
+chunks: Dict[Tuple[int, int], np.ndarray] = {}
+
+# (dx, dy, bit) for each of the eight neighbours feeding a wall's rim mask
+RIM_NEIGHBOURS = (
+    (0, -1, settings.RIM_N), (0, 1, settings.RIM_S),
+    (-1, 0, settings.RIM_W), (1, 0, settings.RIM_E),
+    (-1, -1, settings.RIM_NW), (1, -1, settings.RIM_NE),
+    (-1, 1, settings.RIM_SW), (1, 1, settings.RIM_SE),
+)
+
+# Version stamp per loaded chunk, renewed whenever the chunk is generated or
+# edited. Caches derived from chunk data compare stamps to detect staleness.
+chunk_versions: Dict[Tuple[int, int], int] = {}
+_version_counter = count(1)
+
+def mark_chunk_dirty(cx: int, cy: int) -> None:
+    """
+    Give chunk (cx, cy) a fresh version stamp after its tiles changed.
+    """
+    chunk_versions[(cx, cy)] = next(_version_counter)
+
+# Version stamp per loaded chunk, renewed only when the chunk's wall layer
+# may have changed: on load and on wall edits. Caches that read nothing but
+# walls, like the light map, key on these so floor edits leave them alone.
+wall_versions: Dict[Tuple[int, int], int] = {}
+
+# World tile rects (x0, y0, w, h) whose tiles changed since the renderer last
+# took them; a lone None means there were too many to track.
+changed_regions: list = []
+
+def note_change(x0: int, y0: int, w: int, h: int) -> None:
+    """Record that tiles in the world tile rect changed."""
+    if changed_regions and changed_regions[0] is None:
+        return
+    if len(changed_regions) >= settings.MAX_CHANGED_REGIONS:
+        changed_regions[:] = [None]
+    else:
+        changed_regions.append((x0, y0, w, h))
+
+def take_changes() -> list:
+    """Return and clear the changed tile rects."""
+    changes = changed_regions[:]
+    changed_regions.clear()
+    return changes
+
+# Loaded chunks are rebuilt from the terrain generator plus an edit overlay,
+# {(cx, cy): {ly * CHUNK_SIZE + lx: (floor, wall)}}, holding every tile the
+# player has changed. Overlays outlive their chunks and are all that is
+# saved; unloaded chunks are simply dropped.
+edits: Dict[Tuple[int, int], region.Overlay] = {}
+_regions_read: set = set()  # regions whose saved overlays are in `edits`
+_unsaved: set = set()       # regions with edits not written to disk yet
 
 # ──────────────────────────────────────────────────────────────
 # Chunk Generation & Loading
 # ──────────────────────────────────────────────────────────────
 
-def gen_chunk(cx: int, cy: int) -> Tuple[List[List[int]], List[List[int]]]:
+def gen_chunks(coords: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], np.ndarray]:
     """
-    Generate a chunk at (cx, cy) with floor and wall data.
+    Generate every chunk in `coords` with one vectorized noise evaluation.
+    Returns {(cx, cy): chunk}. Rim masks and depths are left at 0; they are
+    filled once the chunk is installed next to its neighbours.
     """
+    coords = list(coords)
+    if not coords:
+        return {}
     size = settings.CHUNK_SIZE
-    floor = [[settings.TILE_EMPTY for _ in range(size)] for _ in range(size)]
-    wall  = [[settings.TILE_EMPTY for _ in range(size)] for _ in range(size)]
-
-    for ly in range(size):
-        for lx in range(size):
-            wx = cx * size + lx
-            wy = cy * size + ly
-            n = pnoise2(wx * 0.1, wy * 0.1, octaves=2)
-            floor[ly][lx] = settings.TILE_DIRT
-            if n <= 0.0:
-                wall[ly][lx] = settings.TILE_DIRT
-    return floor, wall
+    origins = np.array(coords, dtype=np.int64) * size
+    local = np.arange(size, dtype=np.int64)
+    wx = origins[:, 0, None, None] + local[None, None, :]
+    wy = origins[:, 1, None, None] + local[None, :, None]
+    n = terrain.pnoise2(
+        wx * settings.TERRAIN_SCALE,
+        wy * settings.TERRAIN_SCALE,
+        octaves=settings.TERRAIN_OCTAVES
+    )
+
+    out = {}
+    for idx, coord in enumerate(coords):
+        chunk = np.zeros((CHUNK_LAYERS, size, size), dtype=np.uint8)
+        chunk[LAYER_FLOOR] = settings.TILE_DIRT
+        chunk[LAYER_WALL][n[idx] <= 0.0] = settings.TILE_DIRT
+        out[coord] = chunk
+    return out
+
+def gen_chunk(cx: int, cy: int) -> np.ndarray:
+    """
+    Generate a chunk at (cx, cy) with floor and wall data.
+    """
+    return gen_chunks([(cx, cy)])[(cx, cy)]
 
 def chunk_coords_around(px: int, py: int, radius: int) -> set:
     """
@@ -48,31 +130,316 @@ def chunk_coords_around(px: int, py: int, radius: int) -> set:
 
 def load_chunks(px: int, py: int) -> None:
     """
-    Load all chunks within LOAD_RADIUS of the player and unload distant ones.
-    Also carves the spawn point at (0, 0).
+    Load all chunks within LOAD_RADIUS of the player and unload distant ones,
+    generating missing chunks synchronously. Also carves the spawn point.
     """
     needed = chunk_coords_around(px, py, settings.LOAD_RADIUS)
+    _cancel_requests(needed)
+    changed = _install_chunks(gen_chunks(needed - chunks.keys()))
+    changed += _unload_chunks(needed)
+    _refresh_seams(changed)
+
+def _install_chunks(new_chunks: Dict[Tuple[int, int], np.ndarray]) -> list:
+    """
+    Add freshly generated chunks to `chunks`, carving the spawn point at
+    (0, 0) and applying their edit overlays. Returns the installed
+    coordinates.
+    """
+    for coord, chunk in new_chunks.items():
+        if coord == (0, 0):
+            chunk[LAYER_FLOOR, 0, 0] = settings.TILE_DIRT
+            chunk[LAYER_WALL, 0, 0] = settings.TILE_EMPTY
+        _apply_overlay(chunk, _overlay(coord))
+        chunk[LAYER_WALK] = _walkable(chunk[LAYER_FLOOR], chunk[LAYER_WALL])
+        chunks[coord] = chunk
+        mark_chunk_dirty(*coord)
+        wall_versions[coord] = chunk_versions[coord]
+    return list(new_chunks)
+
+def _unload_chunks(keep: set) -> list:
+    """
+    Drop loaded chunks not in `keep`; their edits stay in the overlays and
+    unsaved ones are written out, so leaving an area saves it. Returns the
+    dropped coordinates.
+    """
+    dropped = [coord for coord in chunks if coord not in keep]
+    for coord in dropped:
+        del chunks[coord]
+        chunk_versions.pop(coord, None)
+        wall_versions.pop(coord, None)
+    save_world(region.region_of(*coord) for coord in dropped)
+    return dropped
+
+def _overlay(coord: Tuple[int, int]) -> Optional[region.Overlay]:
+    """Return the edit overlay of a chunk, reading its region file once."""
+    rc = region.region_of(*coord)
+    if rc not in _regions_read:
+        _regions_read.add(rc)
+        edits.update(region.read_overlays(*rc))
+    return edits.get(coord)
+
+def _apply_overlay(chunk: np.ndarray, overlay: Optional[region.Overlay]) -> None:
+    """Write edited floor and wall tiles over a generated chunk."""
+    if not overlay:
+        return
+    index = np.fromiter(overlay.keys(), dtype=np.intp, count=len(overlay))
+    values = np.array(list(overlay.values()), dtype=np.uint8)
+    chunk[LAYER_FLOOR].reshape(-1)[index] = values[:, 0]
+    chunk[LAYER_WALL].reshape(-1)[index] = values[:, 1]
+
+def save_world(regions: Optional[Iterable[Tuple[int, int]]] = None) -> None:
+    """
+    Write the edit overlays of every region (or just those in `regions`)
+    changed since the last save.
+    """
+    todo = set(_unsaved) if regions is None else _unsaved.intersection(regions)
+    by_region = {rc: {} for rc in todo}
+    for coord, overlay in edits.items():
+        rc = region.region_of(*coord)
+        if rc in by_region:
+            by_region[rc][coord] = overlay
+    for rc, overlays in by_region.items():
+        region.write_overlays(*rc, overlays)
+    _unsaved.difference_update(todo)
+
+def _refresh_seams(changed: list) -> None:
+    """
+    Recompute rim masks and depths of each changed chunk plus the seam tiles
+    of its loaded neighbours, whose outside neighbours just appeared or
+    vanished. Depth reaches MAX_CORE_DEPTH tiles across the seam.
+    """
+    size = settings.CHUNK_SIZE
+    k = settings.MAX_CORE_DEPTH
+    for cx, cy in changed:
+        _refresh_rims(cx * size - 1, cy * size - 1, size + 2, size + 2)
+        _refresh_depths(cx * size - k, cy * size - k, size + 2 * k, size + 2 * k)
+        note_change(cx * size - k, cy * size - k, size + 2 * k, size + 2 * k)
+
+# ──────────────────────────────────────────────────────────────
+# Background Generation
+# ──────────────────────────────────────────────────────────────
+
+_executor: Optional[ThreadPoolExecutor] = None
+_requests: Dict[Tuple[int, int], Future] = {}  # in-flight chunk generation, one future per batch
+_wanted: list = []                               # batches of chunks to stream, nearest first
+
+def prefetch_coords(px: int, py: int, motion: Tuple[int, int]) -> list:
+    """
+    Return the chunks one ring beyond LOAD_RADIUS on the side(s) the player
+    is heading, given motion = (sign dx, sign dy).
+    """
+    r = settings.LOAD_RADIUS
+    pcx = px // settings.CHUNK_SIZE
+    pcy = py // settings.CHUNK_SIZE
+    mx, my = motion
+    ring = []
+    if mx:
+        ring += [(pcx + mx * (r + 1), pcy + d) for d in range(-r - 1, r + 2)]
+    if my:
+        ring += [(pcx + d, pcy + my * (r + 1)) for d in range(-r - 1, r + 2)]
+    return ring
+
+def stream_chunks(px: int, py: int, motion: Tuple[int, int] = (0, 0)) -> None:
+    """
+    Non-blocking counterpart of load_chunks. Queues generation of missing
+    chunks within LOAD_RADIUS, then of the prefetch ring ahead of `motion`,
+    on the worker pool (at most GEN_MAX_IN_FLIGHT at a time), and cancels
+    requests the player has moved away from. Chunks more than one ring
+    outside LOAD_RADIUS are unloaded. Finished chunks are installed by
+    merge_ready_chunks().
+    """
+    global _wanted
+    pcx = px // settings.CHUNK_SIZE
+    pcy = py // settings.CHUNK_SIZE
+    needed = chunk_coords_around(px, py, settings.LOAD_RADIUS)
+    # One batch per ring around the player, then the prefetch ring, so
+    # gen_chunks vectorizes over a whole ring at a time
+    rings: Dict[int, list] = {}
+    for c in needed:
+        rings.setdefault(max(abs(c[0] - pcx), abs(c[1] - pcy)), []).append(c)
+    _wanted = [rings[d] for d in sorted(rings)]
+    _wanted.append([c for c in prefetch_coords(px, py, motion) if c not in needed])
+    _cancel_requests({c for batch in _wanted for c in batch})
+    _submit_wanted()
+
+    keep = chunk_coords_around(px, py, settings.LOAD_RADIUS + 1)
+    _refresh_seams(_unload_chunks(keep))
+
+def _submit_wanted() -> None:
+    """
+    Queue generation of wanted chunks that are neither loaded nor in
+    flight, up to the in-flight cap, as one gen_chunks task per wanted
+    batch. Edits are applied when they install.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(settings.GEN_WORKERS, thread_name_prefix="chunkgen")
+    for batch in _wanted:
+        room = settings.GEN_MAX_IN_FLIGHT - len(_requests)
+        if room <= 0:
+            break
+        todo = [c for c in batch if c not in chunks and c not in _requests][:room]
+        if todo:
+            fut = _executor.submit(gen_chunks, todo)
+            for coord in todo:
+                _requests[coord] = fut
+
+def _cancel_requests(wanted: set) -> None:
+    """
+    Drop in-flight requests for chunks not in `wanted`, cancelling batches
+    none of whose chunks are wanted any more.
+    """
+    dropped = {_requests.pop(c) for c in [c for c in _requests if c not in wanted]}
+    for fut in dropped - set(_requests.values()):
+        fut.cancel()
 
-    # Load missing chunks
-    for coord in needed:
-        if coord not in chunks:
-            chunks[coord] = gen_chunk(*coord)
+def merge_ready_chunks() -> bool:
+    """
+    Install chunks whose generation has finished and queue further wanted
+    chunks into the freed slots. Call from the game loop at a point where
+    no one is iterating `chunks`. Returns True if any chunk was added.
+    """
+    done = {coord: fut for coord, fut in _requests.items() if fut.done()}
+    if not done:
+        return False
+    for coord in done:
+        del _requests[coord]
+    ready = {coord: fut.result()[coord] for coord, fut in done.items()
+             if not fut.cancelled() and coord not in chunks}
+    _refresh_seams(_install_chunks(ready))
+    _submit_wanted()
+    return bool(ready)
 
-    # Unload chunks not needed
-    for coord in list(chunks):
-        if coord not in needed:
-            del chunks[coord]
+def shutdown_workers() -> None:
+    """Cancel outstanding requests and stop the worker pool."""
+    global _executor, _wanted
+    _wanted = []
+    _cancel_requests(set())
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
 
-    # Carve spawn at (0, 0)
-    if (0, 0) in chunks:
-        floor, wall = chunks[(0, 0)]
-        floor[0][0] = settings.TILE_DIRT
-        wall[0][0] = settings.TILE_EMPTY
+# ──────────────────────────────────────────────────────────────
+# Tile Access
+# ──────────────────────────────────────────────────────────────
+
+def _overlaps(x0: int, y0: int, w: int, h: int):
+    """
+    Yield (chunk, chunk_index, region_index) for every loaded chunk that
+    overlaps the world tile rect, where the two indices are matching
+    (row_slice, col_slice) pairs into the chunk's 2D layers and the rect.
+    """
+    size = settings.CHUNK_SIZE
+    for cy in range(y0 // size, (y0 + h - 1) // size + 1):
+        top, bottom = max(y0, cy * size), min(y0 + h, (cy + 1) * size)
+        for cx in range(x0 // size, (x0 + w - 1) // size + 1):
+            chunk = chunks.get((cx, cy))
+            if chunk is None:
+                continue
+            left, right = max(x0, cx * size), min(x0 + w, (cx + 1) * size)
+            yield (
+                chunk,
+                (slice(top - cy * size, bottom - cy * size), slice(left - cx * size, right - cx * size)),
+                (slice(top - y0, bottom - y0), slice(left - x0, right - x0)),
+            )
+
+def read_region(layer: int, x0: int, y0: int, w: int, h: int, fill: int = 0) -> np.ndarray:
+    """
+    Return `layer` over the world tile rect (x0, y0, w, h) as an (h, w) array.
+    Tiles in unloaded chunks read as `fill`.
+    """
+    out = np.full((h, w), fill, dtype=np.uint8)
+    for chunk, (cy_sl, cx_sl), (ry_sl, rx_sl) in _overlaps(x0, y0, w, h):
+        out[ry_sl, rx_sl] = chunk[layer, cy_sl, cx_sl]
+    return out
+
+def write_region(layer: int, x0: int, y0: int, values: np.ndarray) -> None:
+    """
+    Store an (h, w) array into `layer` at world tile (x0, y0). Parts that
+    fall in unloaded chunks are dropped. Does not re-stamp chunks.
+    """
+    h, w = values.shape
+    for chunk, (cy_sl, cx_sl), (ry_sl, rx_sl) in _overlaps(x0, y0, w, h):
+        chunk[layer, cy_sl, cx_sl] = values[ry_sl, rx_sl]
+
+def get_tile(wx: int, wy: int, layer: int) -> Optional[int]:
+    """
+    Return the value of `layer` at world tile (wx, wy), or None if unloaded.
+    """
+    ccx, lx = divmod(wx, settings.CHUNK_SIZE)
+    ccy, ly = divmod(wy, settings.CHUNK_SIZE)
+    chunk = chunks.get((ccx, ccy))
+    if chunk is None:
+        return None
+    return chunk.item(layer, ly, lx)
+
+def set_tile(wx: int, wy: int, layer: int, value: int) -> bool:
+    """
+    Set the floor or wall at world tile (wx, wy) and update everything
+    derived from it. Returns False if the tile is not loaded.
+    """
+    ccx, lx = divmod(wx, settings.CHUNK_SIZE)
+    ccy, ly = divmod(wy, settings.CHUNK_SIZE)
+    chunk = chunks.get((ccx, ccy))
+    if chunk is None:
+        return False
+    chunk[layer, ly, lx] = value
+    floor, wall = chunk.item(LAYER_FLOOR, ly, lx), chunk.item(LAYER_WALL, ly, lx)
+    chunk[LAYER_WALK, ly, lx] = _walkable(floor, wall)
+    edits.setdefault((ccx, ccy), {})[ly * settings.CHUNK_SIZE + lx] = (floor, wall)
+    _unsaved.add(region.region_of(ccx, ccy))
+    if layer == LAYER_WALL:
+        k = settings.MAX_CORE_DEPTH
+        _refresh_rims(wx - 1, wy - 1, 3, 3)
+        _refresh_depths(wx - k, wy - k, 2 * k + 1, 2 * k + 1)
+        note_change(wx - k, wy - k, 2 * k + 1, 2 * k + 1)
+    else:
+        note_change(wx, wy, 1, 1)
+    mark_chunk_dirty(ccx, ccy)
+    if layer == LAYER_WALL:
+        wall_versions[(ccx, ccy)] = chunk_versions[(ccx, ccy)]
+    return True
+
+# ──────────────────────────────────────────────────────────────
+# Wall Rim Masks
+# ──────────────────────────────────────────────────────────────
+
+def _refresh_rims(x0: int, y0: int, w: int, h: int) -> None:
+    """
+    Recompute the rim masks of every loaded tile in the world tile rect.
+    Unloaded tiles count as walls, so no rim is drawn towards the edge of
+    the loaded area.
+    """
+    walls = read_region(LAYER_WALL, x0 - 1, y0 - 1, w + 2, h + 2, settings.TILE_DIRT)
+    walls = walls == settings.TILE_DIRT
+    mask = np.zeros((h, w), dtype=np.uint8)
+    for dx, dy, bit in RIM_NEIGHBOURS:
+        mask[~walls[1 + dy:1 + dy + h, 1 + dx:1 + dx + w]] |= bit
+    mask[~walls[1:-1, 1:-1]] = 0
+    write_region(LAYER_RIM, x0, y0, mask)
+
+def wall_variants() -> set:
+    """
+    Return the distinct (rim mask, depth) pairs of the walls in loaded
+    chunks, i.e. the wall sprites drawing them needs.
+    """
+    if not chunks:
+        return set()
+    pairs = np.concatenate([
+        np.stack([chunk[LAYER_RIM][wall], chunk[LAYER_DEPTH][wall]], axis=1)
+        for chunk in chunks.values()
+        for wall in [chunk[LAYER_WALL] == settings.TILE_DIRT]
+    ])
+    return {tuple(pair) for pair in np.unique(pairs, axis=0).tolist()}
 
 # ──────────────────────────────────────────────────────────────
 # Tile Logic
 # ──────────────────────────────────────────────────────────────
 
+def _walkable(floor, wall):
+    """Walkability of tiles (scalars or arrays): dirt floor, empty wall."""
+    return (floor == settings.TILE_DIRT) & (wall == settings.TILE_EMPTY)
+
 def can_walk(tx: int, ty: int) -> bool:
     """
     Return True if the tile at (tx, ty) is walkable (dirt floor, empty wall).
@@ -80,66 +447,64 @@ def can_walk(tx: int, ty: int) -> bool:
     ccx, ilx = divmod(tx, settings.CHUNK_SIZE)
     ccy, ily = divmod(ty, settings.CHUNK_SIZE)
     chunk = chunks.get((ccx, ccy))
-    if not chunk:
-        return False
-    floor, wall = chunk
-    if not (0 <= ilx < settings.CHUNK_SIZE and 0 <= ily < settings.CHUNK_SIZE):
+    if chunk is None:
         return False
-    return floor[ily][ilx] == settings.TILE_DIRT and wall[ily][ilx] == settings.TILE_EMPTY
+    return chunk.item(LAYER_WALK, ily, ilx) == 1
+
+def can_walk_region(x0: int, y0: int, w: int, h: int) -> np.ndarray:
+    """
+    Batched can_walk: an (h, w) bool array for the world tile rect, False
+    for tiles in unloaded chunks.
+    """
+    return read_region(LAYER_WALK, x0, y0, w, h).view(np.bool_)
+
+def loaded_bounds() -> Optional[Tuple[int, int, int, int]]:
+    """World tile rect (x0, y0, w, h) spanning all loaded chunks, or None."""
+    if not chunks:
+        return None
+    size = settings.CHUNK_SIZE
+    cxs = [cx for cx, _ in chunks]
+    cys = [cy for _, cy in chunks]
+    x0, y0 = min(cxs) * size, min(cys) * size
+    return x0, y0, (max(cxs) + 1) * size - x0, (max(cys) + 1) * size - y0
 
 # ──────────────────────────────────────────────────────────────
 # Wall Depth Calculation
 # ──────────────────────────────────────────────────────────────
 
-def compute_wall_depths(
-    chunks_dict: Dict[Tuple[int, int], Tuple[List[List[int]], List[List[int]]]]
-) -> Dict[Tuple[int, int], int]:
-    """
-    Compute the depth of each wall tile for shading.
-    Returns a dict mapping (wx, wy) to depth.
-    """
-    depth: Dict[Tuple[int, int], int] = {}
-    q = deque()
-
-    # Find all wall edges (depth 0)
-    for (cx, cy), (floor, wall) in chunks_dict.items():
-        base_x = cx * settings.CHUNK_SIZE
-        base_y = cy * settings.CHUNK_SIZE
-        for ly in range(settings.CHUNK_SIZE):
-            for lx in range(settings.CHUNK_SIZE):
-                if wall[ly][lx] != settings.TILE_DIRT:
-                    continue
-                wx, wy = base_x + lx, base_y + ly
-                for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-                    nx, ny = wx + dx, wy + dy
-                    ccx, ilx = divmod(nx, settings.CHUNK_SIZE)
-                    ccy, ily = divmod(ny, settings.CHUNK_SIZE)
-                    neighbor = chunks_dict.get((ccx, ccy))
-                    if (
-                        not neighbor or
-                        not (0 <= ilx < settings.CHUNK_SIZE and 0 <= ily < settings.CHUNK_SIZE) or
-                        neighbor[1][ily][ilx] != settings.TILE_DIRT
-                    ):
-                        depth[(wx, wy)] = 0
-                        q.append((wx, wy))
-                        break
-
-    # BFS to fill in depths
-    while q:
-        wx, wy = q.popleft()
-        d = depth[(wx, wy)]
-        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-            nx, ny = wx + dx, wy + dy
-            if (nx, ny) in depth:
-                continue
-            ccx, ilx = divmod(nx, settings.CHUNK_SIZE)
-            ccy, ily = divmod(ny, settings.CHUNK_SIZE)
-            neighbor = chunks_dict.get((ccx, ccy))
-            if (
-                neighbor and
-                (0 <= ilx < settings.CHUNK_SIZE and 0 <= ily < settings.CHUNK_SIZE) and
-                neighbor[1][ily][ilx] == settings.TILE_DIRT
-            ):
-                depth[(nx, ny)] = d + 1
-                q.append((nx, ny))
-    return depth
+def _refresh_depths(x0: int, y0: int, w: int, h: int) -> None:
+    """
+    Recompute the depth layer of every loaded tile in the world tile rect.
+    A wall's depth is its 4-connected distance to the nearest non-wall tile
+    minus one, capped at MAX_CORE_DEPTH; tiles in unloaded chunks count as
+    non-wall. A capped depth only depends on tiles within MAX_CORE_DEPTH,
+    so that is all the margin read around the rect.
+    """
+    start = time.perf_counter()
+    k = settings.MAX_CORE_DEPTH
+    walls = read_region(LAYER_WALL, x0 - k, y0 - k, w + 2 * k, h + 2 * k, settings.TILE_EMPTY)
+    level = np.pad(walls == settings.TILE_DIRT, 1)
+
+    # Erode layer by layer: a wall is at depth >= d when it and its four
+    # neighbours are all at depth >= d - 1.
+    depth = np.zeros(walls.shape, dtype=np.uint8)
+    for _ in range(k):
+        inner = (
+            level[1:-1, 1:-1] & level[:-2, 1:-1] & level[2:, 1:-1] &
+            level[1:-1, :-2] & level[1:-1, 2:]
+        )
+        if not inner.any():
+            break
+        depth += inner
+        level = np.pad(inner, 1)
+    write_region(LAYER_DEPTH, x0, y0, depth[k:k + h, k:k + w])
+    profiler.add('depths', time.perf_counter() - start)
+
+def compute_wall_depths() -> None:
+    """
+    Recompute the depth layer of all loaded chunks from scratch. Normally
+    unnecessary: edits and chunk loads keep depths up to date locally.
+    """
+    bounds = loaded_bounds()
+    if bounds is not None:
+        _refresh_depths(*bounds)
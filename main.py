@@ -1,82 +1,171 @@
+import os
 import sys
+import argparse
 import pygame
 
-from engine import settings, assets, render
-from game import world, player
+from engine import settings, assets, render, replay, profiler, text, controls
+from game import world, player, pathfind
 from engine import events
 
-def initialize():
-    """Initialize pygame, screen, assets, player, and return all state."""
+def initialize(screen_size=None):
+    """
+    Initialize pygame, screen, assets, player, and return all state.
+    Runs fullscreen unless a windowed `screen_size` is given.
+    """
     pygame.init()
-    info = pygame.display.Info()
-    settings.SCREEN_W, settings.SCREEN_H = info.current_w, info.current_h
-    screen = pygame.display.set_mode((settings.SCREEN_W, settings.SCREEN_H), pygame.FULLSCREEN)
+    if screen_size is None:
+        info = pygame.display.Info()
+        settings.SCREEN_W, settings.SCREEN_H = info.current_w, info.current_h
+        screen = pygame.display.set_mode((settings.SCREEN_W, settings.SCREEN_H), pygame.FULLSCREEN)
+    else:
+        settings.SCREEN_W, settings.SCREEN_H = screen_size
+        screen = pygame.display.set_mode(screen_size)
 
     assets.init_assets()  # <-- Call after display is set!
     render.init_render()
 
     default_tile_size = settings.SCREEN_W // settings.DEFAULT_TILES_ACROSS
-    player_state = player.init_player(default_tile_size)
     assets.update_zoom(default_tile_size)
+    player_state = player.init_player(default_tile_size)  # needs the sprites
     world.load_chunks(player_state['tx'], player_state['ty'])
 
     # Calculate min/max tile size in pixels (min = most zoomed out, max = most zoomed in)
     min_px = settings.SCREEN_W // settings.MAX_TILES_ACROSS
     max_px = settings.SCREEN_W // settings.MIN_TILES_ACROSS
 
+    # Scale the other zoom levels, with the wall sprites the loaded chunks
+    # use, in the background so zooming is a lookup
+    levels = assets.zoom_levels(default_tile_size, min_px, max_px)
+    assets.prewarm_zoom(levels, world.wall_variants())
+
     warn_font = pygame.font.SysFont(None, 24)
 
     # Track last player tile position for chunk loading
     player_state['_last_tx'] = player_state['tx']
     player_state['_last_ty'] = player_state['ty']
 
-    # Compute wall depths once at start
-    wall_depths = world.compute_wall_depths(world.chunks)
-
-    return screen, player_state, default_tile_size, min_px, max_px, warn_font, wall_depths
+    return screen, player_state, default_tile_size, min_px, max_px, warn_font
 
-def game_loop(screen, player_state, default_tile_size, min_px, max_px, warn_font, wall_depths):
+def game_loop(screen, player_state, default_tile_size, min_px, max_px, warn_font, render_frames=True):
     warn_timer = 0.0
     WARN_DURATION = 1.5
+    save_timer = 0.0
     clock = pygame.time.Clock()
     running = True
+    step = 1.0 / settings.SIM_HZ
+    accumulator = 0.0
+    view_state = player_state  # player state as last drawn
 
     while running:
-        dt = clock.tick(settings.FPS) / 1000.0
-
-        # Handle events (including quit)
-        warn_timer, block_changed = events.handle_events(
-            player_state, default_tile_size, min_px, max_px, warn_timer, WARN_DURATION
-        )
-
-        # Update player input and movement (no event.get() here)
-        player.update_input(player_state, assets.TILE_SIZE, dt)
-
-        # Only reload chunks if player moved to a new tile (no wall_depths update here)
-        if (player_state['tx'], player_state['ty']) != (player_state['_last_tx'], player_state['_last_ty']):
-            world.load_chunks(player_state['tx'], player_state['ty'])
-            player_state['_last_tx'] = player_state['tx']
-            player_state['_last_ty'] = player_state['ty']
-
-        # Only recompute wall depths if a block was placed or broken
-        if block_changed:
-            wall_depths = world.compute_wall_depths(world.chunks)
-
-        render.draw_world(screen, player_state, world.chunks, wall_depths)
-
+        dt = replay.tick(clock)
+        profiler.begin_frame()
+
+        # Poll input once; events and every sim step read the same snapshot.
+        # Handles quit and zoom; dig/build clicks are queued.
+        snapshot = controls.poll()
+        events.handle_events(snapshot, player_state, view_state, default_tile_size, min_px, max_px)
+        profiler.mark('events')
+
+        # Click-to-move search, a bounded number of nodes per frame
+        path = pathfind.advance(settings.PATH_NODES_PER_FRAME)
+        if path is not None:
+            player_state['path'] = path
+
+        # Fixed-rate simulation. A slow frame is made up with extra steps
+        # (up to MAX_SIM_STEPS), so load costs frames, not movement.
+        accumulator = min(accumulator + dt, settings.MAX_SIM_STEPS * step)
+        while accumulator >= step:
+            warn_timer = sim_step(player_state, snapshot, step, warn_timer, WARN_DURATION)
+            accumulator -= step
+        profiler.mark('sim')
+
+        # Safe point: install chunks finished by the workers
+        world.merge_ready_chunks()
+
+        # Unloading chunks saves their edits; this covers the area in view
+        save_timer += dt
+        if save_timer >= settings.AUTOSAVE_SECONDS:
+            world.save_world()
+            save_timer = 0.0
+        profiler.mark('chunks')
+
+        # Draw the player between the last two sim states
+        view_state = player.view_state(player_state, accumulator / step)
+        if render_frames:
+            # Wall depths are kept current by world.set_tile and chunk loading
+            render.draw_frame(screen, view_state, world.chunks)
+
+            # Overlays are registered so dirty-rect frames present and restore them
+            if warn_timer > 0:
+                surf = text.render(warn_font, "Cannot Break Spawn Area", (255, 50, 50))
+                x = (settings.SCREEN_W - surf.get_width()) // 2
+                render.add_overlay(screen.blit(surf, (x, 10)))
+            profiler.mark('overlay')
+
+            # Phase timings HUD (F3) and CSV dump (F4)
+            hud = profiler.draw_hud(screen)
+            if hud is not None:
+                render.add_overlay(hud)
+            profiler.mark('hud')
+
+            render.present()
+            profiler.mark('flip')
         if warn_timer > 0:
-            surf = warn_font.render("Cannot Break Spawn Area", True, (255, 50, 50))
-            x = (settings.SCREEN_W - surf.get_width()) // 2
-            screen.blit(surf, (x, 10))
             warn_timer -= dt
-
-        pygame.display.flip()
+        profiler.end_frame()
+    world.shutdown_workers()
+    world.save_world()
     pygame.quit()
     sys.exit()
 
+def sim_step(player_state, snapshot, step, warn_timer, WARN_DURATION):
+    """
+    Advance the simulation by one fixed step: queued world edits, player
+    movement and chunk requests. Returns the updated warn_timer.
+    """
+    warn_timer, _ = events.apply_actions(player_state, warn_timer, WARN_DURATION)
+
+    # Update player input and movement from the frame's snapshot
+    player.update_input(player_state, snapshot, assets.TILE_SIZE, step)
+
+    # Only request chunks if player moved to a new tile.
+    # Generation runs on worker threads, prefetching ahead of the move.
+    if (player_state['tx'], player_state['ty']) != (player_state['_last_tx'], player_state['_last_ty']):
+        motion = (
+            _sign(player_state['target_x'] - player_state['px']),
+            _sign(player_state['target_y'] - player_state['py'])
+        )
+        world.stream_chunks(player_state['tx'], player_state['ty'], motion)
+        player_state['_last_tx'] = player_state['tx']
+        player_state['_last_ty'] = player_state['ty']
+    return warn_timer
+
+def _sign(v: float) -> int:
+    return (v > 0) - (v < 0)
+
 def main():
-    screen, player_state, default_tile_size, min_px, max_px, warn_font, wall_depths = initialize()
-    game_loop(screen, player_state, default_tile_size, min_px, max_px, warn_font, wall_depths)
+    parser = argparse.ArgumentParser(description="Endless digging game")
+    parser.add_argument("--record", metavar="FILE",
+                        help="record input to FILE for later replay (starts a fresh world)")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="replay a recording headlessly and report frame times")
+    parser.add_argument("--report", metavar="FILE",
+                        help="with --replay, also write the frame-time report as JSON")
+    parser.add_argument("--sim-only", action="store_true",
+                        help="with --replay, run the simulation without rendering")
+    args = parser.parse_args()
+
+    screen_size = None
+    if args.replay:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        screen_size = replay.start_replay(args.replay, args.report)
+    elif args.record:
+        replay.start_recording(args.record)
+
+    screen, player_state, default_tile_size, min_px, max_px, warn_font = initialize(screen_size)
+    game_loop(screen, player_state, default_tile_size, min_px, max_px, warn_font,
+              render_frames=not (args.replay and args.sim_only))
 
 if __name__ == "__main__":
     main()